@@ -0,0 +1,272 @@
+"""Content-addressed storage for uploaded documents.
+
+Files are stored once under the SHA-256 hash of their content, encoded with
+the self-describing codec from storage_codec; catalog tables keep only the
+hash (blob_hash) and the original size. Two backends are available, picked from the
+[storage] section of secrets.toml:
+
+    [storage]
+    backend = "local"      # or "supabase"
+    root = "media"         # local backend
+    bucket = "documents"   # supabase backend
+
+Existing rows that still carry base64 filedata can be moved over with:
+
+    python blob_store.py migrate [--table pdfs] [--batch 20]
+"""
+import argparse
+import base64
+import hashlib
+import io
+import logging
+import os
+import tempfile
+
+import streamlit as st
+from postgrest.exceptions import APIError
+
+import metrics
+import storage_codec
+
+DOCUMENT_TABLES = ("pdfs", "subject_notes", "assignments")
+# Postgres foreign_key_violation: the blob is referenced again.
+FOREIGN_KEY_VIOLATION = "23503"
+
+log = logging.getLogger(__name__)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class LocalBlobStore:
+    """Blobs on the local filesystem, fanned out as <root>/ab/cd/<hash>."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path_for(self, blob_hash):
+        return os.path.join(self.root, blob_hash[:2], blob_hash[2:4], blob_hash)
+
+    def exists(self, blob_hash):
+        return os.path.exists(self.path_for(blob_hash))
+
+    def put(self, data):
+        blob_hash = content_hash(data)
+        if not self.exists(blob_hash):
+            self.put_raw(blob_hash, storage_codec.encode(data))
+        return blob_hash
+
+    def put_raw(self, blob_hash, payload):
+        """Write an already encoded payload, such as one read back with open_raw()."""
+        path = self.path_for(blob_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open_raw(self, blob_hash):
+        return open(self.path_for(blob_hash), "rb")
+
+    def iter_chunks(self, blob_hash):
+        with self.open_raw(blob_hash) as f:
+            yield from storage_codec.iter_decoded(f)
+
+    def get(self, blob_hash):
+        return b"".join(self.iter_chunks(blob_hash))
+
+    def delete(self, blob_hash):
+        try:
+            os.remove(self.path_for(blob_hash))
+        except FileNotFoundError:
+            pass
+
+
+class SupabaseBlobStore:
+    """Blobs in a Supabase Storage (S3-compatible) bucket, keyed by hash."""
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+
+    def _bucket(self):
+        from db import get_supabase
+        return get_supabase().storage.from_(self.bucket)
+
+    @staticmethod
+    def path_for(blob_hash):
+        return f"{blob_hash[:2]}/{blob_hash}"
+
+    def exists(self, blob_hash):
+        listing = self._bucket().list(blob_hash[:2], {"search": blob_hash, "limit": 1})
+        return any(item.get("name") == blob_hash for item in listing)
+
+    def put(self, data):
+        blob_hash = content_hash(data)
+        self.put_raw(blob_hash, storage_codec.encode(data))
+        return blob_hash
+
+    def put_raw(self, blob_hash, payload):
+        self._bucket().upload(
+            self.path_for(blob_hash),
+            payload,
+            {"content-type": "application/octet-stream", "upsert": "true"},
+        )
+
+    def open_raw(self, blob_hash):
+        try:
+            return io.BytesIO(self._bucket().download(self.path_for(blob_hash)))
+        except Exception as e:
+            # storage3 reports a missing object as an error carrying {"statusCode": "404", ...}.
+            details = e.args[0] if e.args and isinstance(e.args[0], dict) else {}
+            if str(details.get("statusCode")) == "404":
+                raise FileNotFoundError(blob_hash) from e
+            raise
+
+    def iter_chunks(self, blob_hash):
+        yield from storage_codec.iter_decoded(self.open_raw(blob_hash))
+
+    def get(self, blob_hash):
+        return b"".join(self.iter_chunks(blob_hash))
+
+    def delete(self, blob_hash):
+        self._bucket().remove([self.path_for(blob_hash)])
+
+
+@st.cache_resource(show_spinner=False)
+def get_blob_store():
+    settings = st.secrets.get("storage", {})
+    backend = settings.get("backend", "local")
+    if backend == "local":
+        return LocalBlobStore(settings.get("root", "media"))
+    if backend == "supabase":
+        return SupabaseBlobStore(settings.get("bucket", "documents"))
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def load_row_bytes(row):
+    """Return a catalog row's file bytes from the blob store, or from legacy filedata if not migrated yet."""
+    if row.get("blob_hash"):
+        with metrics.timer("blob_decode_seconds", source="blob"):
+            return get_blob_store().get(row["blob_hash"])
+    if row.get("filedata"):
+        with metrics.timer("blob_decode_seconds", source="filedata"):
+            return storage_codec.decode(base64.b64decode(row["filedata"]))
+    return None
+
+
+def register_blobs(client, store, blobs):
+    """Register stored blobs ({hash: bytes}) in the blobs table, then make sure their files exist.
+
+    A put that found the file already there may have raced with
+    release_blobs() removing it. Checking again once the row exists closes
+    that gap: a release that deleted the row earlier has either removed the
+    file already (it is put back here) or will find the row back after
+    removing it and restore the file itself.
+    """
+    rows = [{"hash": blob_hash, "size": len(data)} for blob_hash, data in blobs.items()]
+    client.table("blobs").upsert(rows, on_conflict="hash", ignore_duplicates=True).execute()
+    for blob_hash, data in blobs.items():
+        if not store.exists(blob_hash):
+            store.put(data)
+
+
+def release_blobs(client, store, hashes):
+    """Delete stored blobs (files and thumbnails) that no document references any more.
+
+    Returns the hashes that were removed. A blob is only removed from the
+    store after its blobs row is gone; the documents' blob_hash and thumb_hash
+    foreign keys refuse that delete while anything still points at it. An
+    upload of the same content that registers the blob again between the row
+    and the file delete gets the file restored (see register_blobs()).
+    """
+    hashes = sorted(set(hashes) - {None})
+    if not hashes:
+        return []
+    referenced = set()
+    for table in DOCUMENT_TABLES:
+        for column in ("blob_hash", "thumb_hash"):
+            rows = client.table(table).select(column).in_(column, hashes).execute().data or []
+            referenced.update(row[column] for row in rows)
+    unreferenced = [blob_hash for blob_hash in hashes if blob_hash not in referenced]
+    if not unreferenced:
+        return []
+
+    released = []
+    try:
+        client.table("blobs").delete().in_("hash", unreferenced).execute()
+        released = unreferenced
+    except APIError as e:
+        if e.code != FOREIGN_KEY_VIOLATION:
+            raise
+        # Something was re-uploaded meanwhile; retry one by one and keep whatever is referenced again.
+        for blob_hash in unreferenced:
+            try:
+                client.table("blobs").delete().eq("hash", blob_hash).execute()
+                released.append(blob_hash)
+            except APIError as e:
+                if e.code != FOREIGN_KEY_VIOLATION:
+                    log.warning("Could not release blob %s: %s", blob_hash, e)
+            except Exception as e:
+                log.warning("Could not release blob %s: %s", blob_hash, e)
+    removed = []
+    for blob_hash in released:
+        try:
+            with store.open_raw(blob_hash) as f:
+                payload = f.read()
+        except FileNotFoundError:
+            removed.append(blob_hash)
+            continue
+        store.delete(blob_hash)
+        if client.table("blobs").select("hash").eq("hash", blob_hash).execute().data:
+            # Registered again by an upload whose put found the file still there.
+            store.put_raw(blob_hash, payload)
+            continue
+        removed.append(blob_hash)
+    return removed
+
+
+def migrate_table(client, store, table, batch_size=20):
+    """Move base64 filedata rows of one table into the blob store; returns the number of rows moved."""
+    moved = 0
+    while True:
+        rows = client.table(table).select("id, filedata") \
+            .is_("blob_hash", "null").not_.is_("filedata", "null") \
+            .limit(batch_size).execute().data or []
+        if not rows:
+            return moved
+        for row in rows:
+            data = storage_codec.decode(base64.b64decode(row["filedata"]))
+            blob_hash = store.put(data)
+            register_blobs(client, store, {blob_hash: data})
+            client.table(table).update({
+                "blob_hash": blob_hash,
+                "size": len(data),
+                "filedata": None
+            }).eq("id", row["id"]).execute()
+            moved += 1
+        print(f"{table}: moved {moved} file(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exam Buddy blob store tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Move base64 filedata columns into the blob store.")
+    migrate.add_argument("--table", choices=DOCUMENT_TABLES, action="append")
+    migrate.add_argument("--batch", type=int, default=20)
+    args = parser.parse_args()
+
+    from db import get_supabase
+    client = get_supabase()
+    store = get_blob_store()
+    for table in args.table or DOCUMENT_TABLES:
+        print(f"{table}: done, {migrate_table(client, store, table, args.batch)} file(s) moved")
+
+
+if __name__ == "__main__":
+    main()
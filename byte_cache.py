@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+
+import metrics
+
+
+class ByteBudgetCache:
+    """Thread-safe LRU whose capacity is a total byte budget rather than an entry count.
+
+    Named caches report their hits and misses as cache_lookups_total.
+    """
+
+    def __init__(self, budget_bytes, sizeof=len, name=None):
+        self.budget_bytes = budget_bytes
+        self.name = name
+        self.used_bytes = 0
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if self.name:
+            metrics.inc("cache_lookups_total", cache=self.name, result="miss" if entry is None else "hit")
+        return entry
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        if size > self.budget_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= self._sizeof(old)
+            self._entries[key] = value
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.used_bytes -= self._sizeof(evicted)
+
+    def discard(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= self._sizeof(old)
+
+    def discard_prefix(self, prefix):
+        """Drop every entry whose tuple key starts with prefix, e.g. all pages of one document."""
+        with self._lock:
+            for key in [key for key in self._entries if key[:len(prefix)] == prefix]:
+                self.used_bytes -= self._sizeof(self._entries.pop(key))
@@ -0,0 +1,257 @@
+"""Catalog reads shared by the pages: cached readers, keyset pagination and search ranking."""
+import functools
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+import metrics
+from db import get_supabase
+from search_index import TrigramIndex, fetch_catalog_names, search_documents
+
+# Listing queries only pull catalog columns; the file blob is fetched by id on demand.
+PDF_CATALOG_COLUMNS = "id, filename, regulation, year, semester, type, size, page_count, thumb_hash"
+NOTES_CATALOG_COLUMNS = "id, filename, subject, regulation, year, size, page_count"
+ASSIGNMENT_CATALOG_COLUMNS = "id, filename, branch, year, semester, subject, unit, size, page_count"
+PAGE_SIZE = 12  # three grid rows of question papers
+
+
+# --- Catalog cache ---
+# Per-table (ttl seconds, max cached queries). Cached readers take the table's
+# current version as an argument, so a write that bumps the version makes the
+# next read miss; the TTL bounds staleness for writes made by other processes.
+CATALOG_CACHE_POLICY = {
+    "pdfs": (600, 256),
+    "subject_notes": (600, 128),
+    "assignments": (600, 128),
+    "weekly_quiz": (120, 64),
+    "aptitude_test": (120, 32),
+    "search": (300, 256),
+    "stats": (60, 4),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _table_versions():
+    return {table: 0 for table in CATALOG_CACHE_POLICY}
+
+
+def table_version(table):
+    return _table_versions().get(table, 0)
+
+
+def invalidate_table(table):
+    versions = _table_versions()
+    versions[table] = versions.get(table, 0) + 1
+
+
+def not_expired():
+    # Expired rows are deleted by the background sweeper; until then they are filtered out here.
+    return f"expire_at.is.null,expire_at.gt.{datetime.now().isoformat()}"
+
+
+_lookup = threading.local()
+
+
+def catalog_cache(table):
+    """st.cache_data with the table's policy, counting hits and misses as cache_lookups_total."""
+    ttl, max_entries = CATALOG_CACHE_POLICY[table]
+
+    def decorate(func):
+        @functools.wraps(func)
+        def load(*args, **kwargs):
+            # Only runs on a miss, in the caller's thread.
+            _lookup.missed = True
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(show_spinner=False, ttl=ttl, max_entries=max_entries)(load)
+
+        @functools.wraps(func)
+        def read(*args, **kwargs):
+            _lookup.missed = False
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                metrics.inc("cache_lookups_total", cache=table, result="miss" if _lookup.missed else "hit")
+
+        read.clear = cached.clear
+        return read
+
+    return decorate
+
+
+def _branch_pdfs_query(branch, reg, year, sem, paper_type, count=None):
+    # Inner-joins pdf_branches so branch and paper filters run in one server-side query.
+    return get_supabase().table("pdfs") \
+        .select(f"{PDF_CATALOG_COLUMNS}, pdf_branches!inner(branch)", count=count) \
+        .eq("pdf_branches.branch", branch) \
+        .eq("regulation", reg) \
+        .eq("year", year) \
+        .eq("semester", sem) \
+        .eq("type", paper_type.lower())
+
+
+def _subject_notes_query(reg, year, count=None):
+    return get_supabase().table("subject_notes").select(NOTES_CATALOG_COLUMNS, count=count) \
+        .eq("regulation", reg).eq("year", year)
+
+
+def _assignments_query(branch, year, sem, unit, count=None):
+    query = get_supabase().table("assignments").select(ASSIGNMENT_CATALOG_COLUMNS, count=count) \
+        .eq("branch", branch) \
+        .eq("year", year) \
+        .eq("semester", sem)
+    if unit != "--":
+        query = query.eq("unit", unit)
+    return query
+
+
+def fetch_catalog_page(query, after_id=None, limit=PAGE_SIZE):
+    """Keyset page of a catalog query, newest first: {"rows", "next" cursor or None, "total"}.
+
+    The total is only counted on the first page; later pages count what is left after the cursor.
+    """
+    if after_id is not None:
+        query = query.lt("id", after_id)
+    result = query.order("id", desc=True).limit(limit + 1).execute()
+    rows = result.data or []
+    return {
+        "rows": rows[:limit],
+        "next": rows[limit - 1]["id"] if len(rows) > limit else None,
+        "total": result.count if after_id is None else None,
+    }
+
+
+def list_page(items, offset=None, limit=PAGE_SIZE):
+    """The same page shape for results that are already ranked in memory, with an offset cursor."""
+    offset = offset or 0
+    return {
+        "rows": items[offset:offset + limit],
+        "next": offset + limit if offset + limit < len(items) else None,
+        "total": len(items),
+    }
+
+
+# Full result sets are only fetched to rank search hits; plain browsing goes through the *_page readers.
+@catalog_cache("pdfs")
+def get_branch_pdfs(branch, reg, year, sem, paper_type, version=0):
+    return _branch_pdfs_query(branch, reg, year, sem, paper_type).order("id", desc=True).execute().data or []
+
+
+@catalog_cache("pdfs")
+def get_branch_pdfs_page(branch, reg, year, sem, paper_type, after_id=None, version=0):
+    return fetch_catalog_page(_branch_pdfs_query(branch, reg, year, sem, paper_type, count="exact"), after_id)
+
+
+@catalog_cache("subject_notes")
+def get_subject_notes(reg, year, version=0):
+    return _subject_notes_query(reg, year).order("id", desc=True).execute().data or []
+
+
+@catalog_cache("subject_notes")
+def get_subject_notes_page(reg, year, after_id=None, version=0):
+    return fetch_catalog_page(_subject_notes_query(reg, year, count="exact"), after_id)
+
+
+@catalog_cache("assignments")
+def get_assignments(branch, year, sem, unit, version=0):
+    return _assignments_query(branch, year, sem, unit).order("id", desc=True).execute().data or []
+
+
+@catalog_cache("assignments")
+def get_assignments_page(branch, year, sem, unit, after_id=None, version=0):
+    return fetch_catalog_page(_assignments_query(branch, year, sem, unit, count="exact"), after_id)
+
+
+@catalog_cache("weekly_quiz")
+def get_weekly_quizzes(year, semester, branch, version=0):
+    result = get_supabase().table("weekly_quiz").select("*") \
+        .eq("year", year).eq("semester", semester).eq("branch", branch) \
+        .or_(not_expired()) \
+        .order("uploaded_at", desc=True).limit(10).execute()
+    return result.data or []
+
+
+@catalog_cache("aptitude_test")
+def get_latest_aptitude_test(year, version=0):
+    result = get_supabase().table("aptitude_test").select("*").eq("year", year).or_(not_expired()) \
+        .order("uploaded_at", desc=True).limit(1).execute()
+    return result.data[0] if result.data else None
+
+
+STATS_TABLES = ("pdfs", "subject_notes", "assignments", "weekly_quiz", "aptitude_test")
+
+
+@catalog_cache("stats")
+def get_catalog_stats(versions=()):
+    """{table: {"total", "active", "total_bytes"}} for the dashboard, counted server-side."""
+    try:
+        rows = get_supabase().table("catalog_stats").select("*").execute().data or []
+        return {row["table_name"]: row for row in rows}
+    except Exception:
+        # View not migrated yet: one head-only exact count per table, still no rows transferred.
+        stats = {}
+        for table in STATS_TABLES:
+            total = get_supabase().table(table).select("id", count="exact", head=True).execute().count or 0
+            stats[table] = {"table_name": table, "total": total, "active": total, "total_bytes": None,
+                            "recent": None}
+        return stats
+
+
+@catalog_cache("stats")
+def get_monthly_trends(since, versions=()):
+    """Month buckets of uploads and downloads since a date, summed over branches."""
+    result = get_supabase().table("activity_rollups").select("bucket, table_name, metric, count") \
+        .eq("granularity", "month").eq("branch", "").gte("bucket", since) \
+        .in_("metric", ["uploads", "download"]).execute()
+    return result.data or []
+
+
+@catalog_cache("search")
+def search_catalog(table, query, branch=None, regulation=None, year=None, semester=None, version=0):
+    return search_documents(get_supabase(), query, table=table, branch=branch, regulation=regulation,
+                            year=year, semester=semester)
+
+
+@st.cache_resource(show_spinner=False, ttl=CATALOG_CACHE_POLICY["search"][0], max_entries=2)
+def get_fuzzy_index(versions):
+    # cache_resource hands out the same object instead of unpickling a copy per rerun.
+    return TrigramIndex(fetch_catalog_names(get_supabase()))
+
+
+def fuzzy_index():
+    return get_fuzzy_index(tuple(table_version(table) for table in ("pdfs", "subject_notes", "assignments")))
+
+
+def apply_search(rows, search_term, table, name_fields=("filename",), **filters):
+    """Keep rows matching search_term: full-text hits by rank, then name matches, then fuzzy name matches."""
+    if not search_term:
+        return rows
+    try:
+        hits = search_catalog(table, search_term, version=table_version(table), **filters)
+    except Exception:
+        # Index not reachable: fall back to matching names only.
+        hits = []
+    try:
+        # Only the filtered rows compete, so hits under other filters cannot push them out of a top-N.
+        candidates = {str(row["id"]) for row in rows}
+        fuzzy = {hit[2]: hit[0] for hit in fuzzy_index().search(search_term, table=table, limit=None,
+                                                                 ids=candidates)}
+    except Exception:
+        fuzzy = {}
+    ranked = {hit["id"]: (position, hit.get("snippet")) for position, hit in enumerate(hits)}
+
+    matched = []
+    for row in rows:
+        row_id = str(row["id"])
+        hit = ranked.get(row_id)
+        if hit:
+            order = (0, hit[0])
+        elif any(search_term in (row.get(field) or "").lower() for field in name_fields):
+            order = (1, 0)
+        elif row_id in fuzzy:
+            order = (2, -fuzzy[row_id])
+        else:
+            continue
+        matched.append((order, {**row, "snippet": hit[1] if hit else None}))
+    return [row for _, row in sorted(matched, key=lambda item: item[0])]
@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+
+import httpx
+import streamlit as st
+from supabase import Client, ClientOptions, create_client
+
+import metrics
+
+# --- Connection settings ---
+# Optional overrides live under [supabase] in secrets.toml next to url/key.
+SUPABASE_URL = st.secrets["supabase"]["url"]
+SUPABASE_KEY = st.secrets["supabase"]["key"]
+
+_settings = st.secrets["supabase"]
+POOL_SIZE = int(_settings.get("pool_size", 10))
+POOL_KEEPALIVE = int(_settings.get("pool_keepalive", 5))
+KEEPALIVE_EXPIRY = float(_settings.get("keepalive_expiry", 30))
+CONNECT_TIMEOUT = float(_settings.get("connect_timeout", 5))
+REQUEST_TIMEOUT = float(_settings.get("request_timeout", 20))
+HEALTH_CHECK_INTERVAL = float(_settings.get("health_check_interval", 60))
+
+log = logging.getLogger(__name__)
+
+
+_REST_OPERATIONS = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+# Storage routes /object/<route>/...; any other /object/<bucket>/<path> is labelled by method.
+_STORAGE_ROUTES = {"list": "list", "list-v2": "list", "info": "info", "move": "move", "copy": "copy",
+                   "sign": "sign", "upload/sign": "sign", "public": "download", "authenticated": "download"}
+_STORAGE_OPERATIONS = {"GET": "download", "HEAD": "info", "POST": "upload", "PUT": "upload", "DELETE": "remove"}
+
+
+def request_labels(request):
+    """(table, operation) for a Supabase HTTP request, e.g. ("pdfs", "select") or ("search_documents", "rpc")."""
+    parts = [part for part in request.url.path.split("/") if part]
+    if parts[:2] == ["rest", "v1"] and len(parts) > 2:
+        if parts[2] == "rpc" and len(parts) > 3:
+            return parts[3], "rpc"
+        operation = _REST_OPERATIONS.get(request.method, request.method.lower())
+        if operation == "insert" and "resolution=" in request.headers.get("prefer", ""):
+            operation = "upsert"
+        return parts[2], operation
+    if parts[:3] == ["storage", "v1", "object"]:
+        bucket, operation = _storage_labels(request.method, parts[3:])
+        return f"storage:{bucket}", operation
+    return "other", request.method.lower()
+
+
+def _storage_labels(method, parts):
+    """(bucket, operation) for the path after /storage/v1/object/, e.g. ("documents", "list") for a list POST."""
+    route = "upload/sign" if parts[:2] == ["upload", "sign"] else parts[0] if parts else ""
+    if route in _STORAGE_ROUTES:
+        parts = parts[len(route.split("/")):]
+        operation = _STORAGE_ROUTES[route]
+        if route in ("sign", "upload/sign") and method != "POST":
+            # Using a signed URL rather than creating one: GET downloads, PUT uploads.
+            operation = _STORAGE_OPERATIONS.get(method, method.lower())
+    else:
+        operation = _STORAGE_OPERATIONS.get(method, method.lower())
+    # move and copy name their buckets in the request body.
+    return (parts[0] if parts else ""), operation
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """Records the latency of every Supabase request, up to the response headers, by table and operation."""
+
+    def handle_request(self, request):
+        table, operation = request_labels(request)
+        started = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            metrics.inc("supabase_request_errors_total", table=table, operation=operation)
+            raise
+        finally:
+            metrics.observe("supabase_request_seconds", time.perf_counter() - started,
+                            table=table, operation=operation)
+        if response.status_code >= 400:
+            metrics.inc("supabase_request_errors_total", table=table, operation=operation)
+        return response
+
+
+def _build_http_client():
+    limits = httpx.Limits(
+        max_connections=POOL_SIZE,
+        max_keepalive_connections=POOL_KEEPALIVE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    return httpx.Client(
+        # Limits go on the transport once one is given; the client's own are then unused.
+        transport=InstrumentedTransport(limits=limits),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+    )
+
+
+def _build_options(http_client):
+    try:
+        return ClientOptions(
+            httpx_client=http_client,
+            postgrest_client_timeout=REQUEST_TIMEOUT,
+            storage_client_timeout=REQUEST_TIMEOUT,
+        )
+    except TypeError:
+        # Older supabase-py releases manage their own httpx session, which the request metrics do not see.
+        log.warning("This supabase-py does not accept httpx_client: pool limits, keepalive settings and "
+                    "supabase_request_* metrics are not in effect. Upgrade supabase to fix this.")
+        return ClientOptions(
+            postgrest_client_timeout=REQUEST_TIMEOUT,
+            storage_client_timeout=REQUEST_TIMEOUT,
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_client():
+    """Build the process-wide Supabase client once; every rerun and session reuses it."""
+    http_client = _build_http_client()
+    client = create_client(SUPABASE_URL, SUPABASE_KEY, options=_build_options(http_client))
+    return {"client": client, "http": http_client, "checked_at": time.monotonic()}
+
+
+def _is_healthy(client):
+    try:
+        client.table("pdfs").select("id").limit(1).execute()
+        return True
+    except Exception:
+        return False
+
+
+def _close_http_client(http_client):
+    try:
+        http_client.close()
+    except Exception:
+        log.exception("Closing a replaced Supabase connection pool failed")
+
+
+def reset_supabase():
+    """Drop the shared client so the next call rebuilds it.
+
+    Other sessions may still be mid-request on the old client, so its
+    connection pool is only closed once any such request has timed out.
+    """
+    shared = _shared_client()
+    _shared_client.clear()
+    closer = threading.Timer(CONNECT_TIMEOUT + REQUEST_TIMEOUT, _close_http_client, [shared["http"]])
+    closer.daemon = True
+    closer.start()
+
+
+def get_supabase() -> Client:
+    shared = _shared_client()
+    now = time.monotonic()
+    if now - shared["checked_at"] > HEALTH_CHECK_INTERVAL:
+        shared["checked_at"] = now
+        if not _is_healthy(shared["client"]):
+            reset_supabase()
+            shared = _shared_client()
+    return shared["client"]
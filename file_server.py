@@ -0,0 +1,386 @@
+"""Streaming file endpoint for question papers, notes and assignments.
+
+Runs next to the Streamlit app so downloads never pass through a session's
+media store:
+
+    python file_server.py --host 0.0.0.0 --port 8502
+
+GET/HEAD /files/<table>/<id> streams the document in chunks and supports
+single-range Range requests, ETag / If-None-Match and Last-Modified /
+If-Modified-Since. Add ?inline=1 to open the PDF in the browser instead of
+downloading it.
+
+An uncached full download is decompressed from the blob store straight onto
+the socket, so memory holds one chunk at a time; files up to
+STREAM_CACHE_MAX are cached on the way through. Range requests decode the
+file whole once and serve it from the cache.
+
+GET/HEAD /thumbs/<hash> serves the first-page thumbnails stored at upload
+time. They are content-addressed, so browsers may cache them forever.
+
+GET/HEAD /assets/<name>.json serves the optimized Lottie animations from
+lottie_assets when the app runs with lottie_mode = "static".
+
+Document downloads are recorded as telemetry events; thumbnails are not.
+
+GET /metrics returns this process's request, decode and cache metrics in
+Prometheus text format (see metrics.py).
+"""
+import argparse
+import hashlib
+import logging
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from blob_store import get_blob_store, load_row_bytes
+from byte_cache import ByteBudgetCache
+from db import get_supabase
+import lottie_assets
+import metrics
+import storage_codec
+import telemetry
+
+SERVED_TABLES = {"pdfs", "subject_notes", "assignments"}
+CHUNK_SIZE = 64 * 1024
+CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+# Streamed files up to this size are also kept in the cache; larger ones are never held whole.
+STREAM_CACHE_MAX = 16 * 1024 * 1024
+
+_PATH_RE = re.compile(r"^/files/(?P<table>[a-z_]+)/(?P<file_id>[\w-]+)$")
+_THUMB_RE = re.compile(r"^/thumbs/(?P<blob_hash>[0-9a-f]{64})$")
+_ASSET_RE = re.compile(r"^/assets/(?P<name>[a-z_]+)\.json$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+log = logging.getLogger(__name__)
+
+
+file_cache = ByteBudgetCache(CACHE_BUDGET_BYTES, sizeof=lambda entry: len(entry["data"]), name="file_server")
+
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.replace(microsecond=0)
+
+
+def load_file(table, file_id):
+    """The cached entry for a document, or on a miss one that streams it.
+
+    A cache hit still costs a one-column lookup by id, so deleted documents
+    stop being served and replaced ones are reloaded.
+
+    Blob-backed rows with a known size come back without "data": the caller
+    either streams them with stream_file() or reads them whole with
+    read_file(). Legacy filedata rows are always decoded whole.
+    """
+    key = (table, file_id)
+    entry = file_cache.get(key)
+    if entry is not None:
+        # The cache is per process: a document deleted or replaced through the app must not outlive it here.
+        current = get_supabase().table(table).select("blob_hash").eq("id", file_id).limit(1).execute().data
+        if current and current[0].get("blob_hash") == entry.get("blob_hash"):
+            return entry
+        file_cache.discard(key)
+        if not current:
+            return None
+
+    result = get_supabase().table(table).select("filename, blob_hash, filedata, size, uploaded_at") \
+        .eq("id", file_id).limit(1).execute()
+    if not result.data:
+        return None
+    row = result.data[0]
+    entry = {
+        "key": key,
+        "filename": row.get("filename") or f"{file_id}.pdf",
+        "last_modified": _parse_timestamp(row.get("uploaded_at")),
+        "content_type": "application/pdf",
+        "cache_control": "public, max-age=3600",
+    }
+    if row.get("blob_hash") and row.get("size"):
+        return {**entry, "blob_hash": row["blob_hash"], "size": row["size"], "etag": f'"{row["blob_hash"]}"'}
+    data = load_row_bytes(row)
+    if data is None:
+        return None
+    entry = {**entry, "data": data, "etag": f'"{row.get("blob_hash") or hashlib.sha256(data).hexdigest()}"'}
+    file_cache.put(key, entry)
+    return entry
+
+
+def open_file(entry):
+    """Open a streamable entry's stored payload; FileNotFoundError if the blob is gone."""
+    return get_blob_store().open_raw(entry["blob_hash"])
+
+
+def read_file(entry):
+    """Decode a streamable entry whole (for range requests) and cache it."""
+    with metrics.timer("blob_decode_seconds", source="blob"):
+        data = b"".join(get_blob_store().iter_chunks(entry["blob_hash"]))
+    entry = {**entry, "data": data}
+    file_cache.put(entry["key"], entry)
+    return entry
+
+
+def stream_file(entry, raw, write):
+    """Decompress an opened payload (see open_file) straight to write(); caches it too when it fits STREAM_CACHE_MAX.
+
+    Returns the number of bytes written.
+    """
+    keep = bytearray() if entry["size"] <= STREAM_CACHE_MAX else None
+    written = 0
+    with raw:
+        for chunk in storage_codec.iter_decoded(raw):
+            write(chunk)
+            written += len(chunk)
+            if keep is not None:
+                keep += chunk
+    if written != entry["size"]:
+        log.warning("%s/%s: streamed %d bytes, catalog size is %d", *entry["key"], written, entry["size"])
+    elif keep is not None:
+        file_cache.put(entry["key"], {**entry, "data": bytes(keep)})
+    return written
+
+
+def load_thumbnail(blob_hash):
+    key = ("thumbs", blob_hash)
+    entry = file_cache.get(key)
+    if entry is not None:
+        return entry
+    try:
+        with metrics.timer("blob_decode_seconds", source="thumbnail"):
+            data = get_blob_store().get(blob_hash)
+    except FileNotFoundError:
+        return None
+    entry = {
+        "filename": f"{blob_hash}.jpg",
+        "data": data,
+        "etag": f'"{blob_hash}"',
+        "last_modified": None,
+        "content_type": "image/jpeg",
+        "cache_control": "public, max-age=31536000, immutable",
+    }
+    file_cache.put(key, entry)
+    return entry
+
+
+def load_asset(name):
+    if name not in lottie_assets.ANIMATIONS:
+        return None
+    asset = lottie_assets.get_animation(name)
+    if asset is None:
+        return None
+    return {
+        "filename": f"{name}.json",
+        "data": asset["json"].encode(),
+        "etag": asset["etag"],
+        "last_modified": None,
+        "content_type": "application/json",
+        "cache_control": "public, max-age=86400",
+        # The player fetches it from the Streamlit page's origin.
+        "cors": True,
+        "inline": True,
+    }
+
+
+def parse_range(header, total):
+    """Return (start, end) inclusive for a single byte range, None if absent, or False if unsatisfiable."""
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return False
+    start, end = match.groups()
+    if start == "":
+        length = int(end)
+        if length == 0:
+            return False
+        return max(total - length, 0), total - 1
+    start = int(start)
+    end = int(end) if end else total - 1
+    if start >= total or end < start:
+        return False
+    return start, min(end, total - 1)
+
+
+class FileRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ExamBuddyFiles/1.0"
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            self._serve_metrics(send_body)
+            return
+        match = _PATH_RE.match(url.path)
+        thumb_match = _THUMB_RE.match(url.path)
+        asset_match = _ASSET_RE.match(url.path)
+        if not thumb_match and not asset_match and (not match or match.group("table") not in SERVED_TABLES):
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            if thumb_match:
+                entry = load_thumbnail(thumb_match.group("blob_hash"))
+            elif asset_match:
+                entry = load_asset(asset_match.group("name"))
+            else:
+                entry = load_file(match.group("table"), match.group("file_id"))
+        except Exception as e:
+            self.send_error(HTTPStatus.BAD_GATEWAY, f"Storage error: {e}")
+            return
+        if entry is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        if self._not_modified(entry):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(entry)
+            self.end_headers()
+            return
+
+        data = entry.get("data")
+        total = len(data) if data is not None else entry["size"]
+        byte_range = parse_range(self.headers.get("Range"), total)
+        if byte_range and not self._if_range_matches(entry):
+            byte_range = None
+        if byte_range and data is None:
+            # Ranges are served from the decoded file; only full-body GETs stream.
+            try:
+                entry = read_file(entry)
+            except FileNotFoundError:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            except Exception as e:
+                self.send_error(HTTPStatus.BAD_GATEWAY, f"Storage error: {e}")
+                return
+            data = entry["data"]
+        if byte_range is False:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{total}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        raw = None
+        if data is None:
+            # Once the status line is out a missing blob can only be an empty 200, so find out first.
+            try:
+                if send_body:
+                    raw = open_file(entry)
+                elif not get_blob_store().exists(entry["blob_hash"]):
+                    raise FileNotFoundError(entry["blob_hash"])
+            except FileNotFoundError:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            except Exception as e:
+                self.send_error(HTTPStatus.BAD_GATEWAY, f"Storage error: {e}")
+                return
+
+        if byte_range:
+            start, end = byte_range
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+        else:
+            start, end = 0, total - 1
+            self.send_response(HTTPStatus.OK)
+
+        inline = entry.get("inline") or parse_qs(url.query).get("inline") == ["1"]
+        disposition = "inline" if inline else "attachment"
+        self.send_header("Content-Type", entry["content_type"])
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Disposition", f"{disposition}; filename*=UTF-8''{quote(entry['filename'])}")
+        self.send_header("Cache-Control", entry["cache_control"])
+        if entry.get("cors"):
+            self.send_header("Access-Control-Allow-Origin", "*")
+        self._send_validators(entry)
+        self.end_headers()
+
+        if send_body and match and not inline and start == 0:
+            # Resumed and parallel range requests would otherwise count one download several times.
+            telemetry.record("download", match.group("table"), match.group("file_id"))
+
+        if raw is not None:
+            stream_file(entry, raw, self.wfile.write)
+        elif send_body:
+            view = memoryview(data)
+            for offset in range(start, end + 1, CHUNK_SIZE):
+                self.wfile.write(view[offset:min(offset + CHUNK_SIZE, end + 1)])
+
+    def _serve_metrics(self, send_body):
+        body = metrics.registry.render().encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_validators(self, entry):
+        self.send_header("ETag", entry["etag"])
+        if entry["last_modified"]:
+            self.send_header("Last-Modified", format_datetime(entry["last_modified"], usegmt=True))
+
+    def _not_modified(self, entry):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or entry["etag"] in tags
+        since = self.headers.get("If-Modified-Since")
+        if since and entry["last_modified"]:
+            try:
+                return entry["last_modified"] <= parsedate_to_datetime(since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _if_range_matches(self, entry):
+        if_range = self.headers.get("If-Range")
+        if not if_range:
+            return True
+        if if_range.startswith('"'):
+            return if_range == entry["etag"]
+        if entry["last_modified"]:
+            try:
+                return entry["last_modified"] <= parsedate_to_datetime(if_range)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Exam Buddy documents over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+
+    metrics.registry.process = "files"
+    server = ThreadingHTTPServer((args.host, args.port), FileRequestHandler)
+    print(f"Serving files on http://{args.host}:{args.port}/files/<table>/<id>")
+    print(f"Metrics on http://{args.host}:{args.port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        telemetry.get_telemetry().close()
+
+
+if __name__ == "__main__":
+    main()
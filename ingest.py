@@ -0,0 +1,199 @@
+"""Bulk ingest pipeline for question papers, notes and assignments.
+
+Files are deduplicated by the SHA-256 of their stored content, not by name:
+the same paper uploaded twice under different names is stored once, while a
+corrected paper that keeps the old name is accepted. Blobs are registered in
+the shared blobs table, so one file can back several documents (e.g. the
+same paper under two regulations) without being stored twice.
+
+A batch costs bounded concurrent blob uploads on a thread pool, one
+duplicate query, one blobs upsert, one multi-row insert per
+INSERT_BATCH_SIZE documents and one insert for all of their branch
+mappings. Progress is reported as progress(fraction, message) from the
+calling thread only, so Streamlit widgets can be updated from the callback.
+
+delete_documents() is the way back out: one delete for any number of
+documents, after which blobs that nothing references any more are removed.
+A delete that releases a blob while the same content is being uploaded is
+handled on both sides: the upload puts missing files back after registering
+them and retries an insert whose blob was released meanwhile, and the
+release restores a file whose row came back (see blob_store.register_blobs).
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+from blob_store import FOREIGN_KEY_VIOLATION, get_blob_store, register_blobs, release_blobs
+from preview import catalog_metadata, fitz_lock
+from search_index import extract_text
+
+UPLOAD_WORKERS = 4
+INSERT_BATCH_SIZE = 50
+
+
+def find_existing(client, table, blob_hashes, filters):
+    """Return {blob_hash: id} for documents of the batch that already exist with the same metadata."""
+    if not blob_hashes:
+        return {}
+    query = client.table(table).select("id, blob_hash").in_("blob_hash", blob_hashes)
+    for key, val in filters.items():
+        query = query.eq(key, val)
+    return {row["blob_hash"]: row["id"] for row in query.execute().data or []}
+
+
+def _prepare(filename, data, optimize):
+    """Store one file and its thumbnail; returns (row, {hash: bytes} to register, compression report)."""
+    report = None
+    if optimize:
+        from pdf_compress import compress_pdf
+        data, report = compress_pdf(data, lock=fitz_lock)
+    # Content-addressed puts are idempotent, so storing before the duplicate check is safe.
+    blob_hash = get_blob_store().put(data)
+    metadata, thumbnail = catalog_metadata(data)
+    row = {
+        "filename": filename,
+        "blob_hash": blob_hash,
+        "size": len(data),
+        "content_text": extract_text(data),
+        **metadata,
+    }
+    blobs = {blob_hash: data}
+    if thumbnail:
+        blobs[metadata["thumb_hash"]] = thumbnail
+    return row, blobs, report
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def ingest_documents(client, table, files, filters, branches=(), optimize=False, progress=None):
+    """Upload (filename, bytes) pairs into table; returns one result dict per file.
+
+    Each result has "file", "status" ("uploaded", "duplicate" or "failed"),
+    "detail" and, when optimize is set, the compression "report".
+    """
+    total = len(files) or 1
+    results = []
+    stored = set()
+
+    def notify(message):
+        # A stored blob is half of the work for a file; the insert is the other half.
+        if progress:
+            progress((len(results) + 0.5 * len(stored)) / total, message)
+
+    def finish(index, status, detail="", report=None):
+        stored.discard(index)
+        results.append({"file": files[index][0], "status": status, "detail": detail, "report": report})
+        notify(f"{files[index][0]}: {status}")
+
+    # Blob uploads run concurrently; results are still collected on this thread.
+    store = get_blob_store()
+    prepared = {}
+    blobs = {}
+    reports = {}
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+        futures = {pool.submit(_prepare, name, data, optimize): index for index, (name, data) in enumerate(files)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                prepared[index], blobs[index], reports[index] = future.result()
+                stored.add(index)
+                notify(f"{files[index][0]}: stored")
+            except Exception as e:
+                finish(index, "failed", f"storage error: {e}")
+
+    try:
+        existing = find_existing(client, table, sorted({row["blob_hash"] for row in prepared.values()}), filters)
+    except Exception as e:
+        for index in sorted(prepared):
+            finish(index, "failed", f"duplicate check failed: {e}", reports[index])
+        return results
+
+    link_note = ""
+    if branches and existing:
+        # A paper re-uploaded for more branches only needs the extra mappings.
+        mappings = [{"pdf_id": doc_id, "branch": branch} for doc_id in existing.values() for branch in branches]
+        try:
+            client.table("pdf_branches").upsert(mappings, on_conflict="pdf_id,branch",
+                                                ignore_duplicates=True).execute()
+            link_note = "; selected branches linked"
+        except Exception as e:
+            link_note = f"; linking branches failed: {e}"
+
+    pending = []
+    seen = {}
+    for index in sorted(prepared):
+        blob_hash = prepared[index]["blob_hash"]
+        if blob_hash in existing:
+            finish(index, "duplicate", f"same content already uploaded (#{existing[blob_hash]}){link_note}",
+                   reports[index])
+        elif blob_hash in seen:
+            finish(index, "duplicate", f"same content as {files[seen[blob_hash]][0]} in this batch", reports[index])
+        else:
+            seen[blob_hash] = index
+            pending.append(index)
+
+    if not pending:
+        return results
+    try:
+        # Files and their thumbnails; a hash shared by several files is registered once.
+        registry = {blob_hash: data for index in pending for blob_hash, data in blobs[index].items()}
+        register_blobs(client, store, registry)
+    except Exception as e:
+        for index in pending:
+            finish(index, "failed", f"blob registry failed: {e}", reports[index])
+        return results
+
+    uploaded_at = datetime.now().isoformat()
+    for batch in _chunks(pending, INSERT_BATCH_SIZE):
+        rows = [{**filters, **prepared[index], "uploaded_at": uploaded_at} for index in batch]
+        try:
+            try:
+                inserted = client.table(table).insert(rows).execute().data or []
+            except APIError as e:
+                if e.code != FOREIGN_KEY_VIOLATION:
+                    raise
+                # A delete released one of the blobs after it was registered; register it again, once.
+                register_blobs(client, store, {blob_hash: data for index in batch
+                                               for blob_hash, data in blobs[index].items()})
+                inserted = client.table(table).insert(rows).execute().data or []
+        except Exception as e:
+            for index in batch:
+                finish(index, "failed", str(e), reports[index])
+            continue
+
+        if branches and inserted:
+            mappings = [{"pdf_id": doc["id"], "branch": branch} for doc in inserted for branch in branches]
+            try:
+                client.table("pdf_branches").insert(mappings).execute()
+            except Exception as e:
+                # Without branch mappings the papers would be invisible, so roll the batch back.
+                client.table(table).delete().in_("id", [doc["id"] for doc in inserted]).execute()
+                for index in batch:
+                    finish(index, "failed", f"branch mapping failed: {e}", reports[index])
+                continue
+
+        for index in batch:
+            finish(index, "uploaded", report=reports[index])
+
+    return results
+
+
+def delete_documents(client, table, ids):
+    """Delete documents by id in one request; returns (deleted rows, released blob hashes).
+
+    Branch mappings of deleted papers go with them (ON DELETE CASCADE on
+    pdf_branches); file and thumbnail blobs are released once unreferenced.
+    """
+    if not ids:
+        return [], []
+    rows = client.table(table).select("id, filename, blob_hash, thumb_hash").in_("id", list(ids)).execute().data or []
+    if not rows:
+        return [], []
+    # Minimal return: the deleted rows would otherwise come back with their full content_text.
+    client.table(table).delete(returning=ReturnMethod.minimal).in_("id", [row["id"] for row in rows]).execute()
+    hashes = {row.get("blob_hash") for row in rows} | {row.get("thumb_hash") for row in rows}
+    return rows, release_blobs(client, get_blob_store(), hashes)
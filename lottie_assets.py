@@ -0,0 +1,154 @@
+"""Compact Lottie animations for the sidebar and home page.
+
+The exported animations carry full-precision floats, editor metadata and
+layers that are never on screen. optimize() rounds every number to PRECISION
+decimals, drops layers that are hidden or have no visible frames (unless
+another layer uses them as a parent or track matte), and strips keys the
+players ignore, names included unless an expression may look them up. The
+result is built and serialized once per process.
+
+By default the animation data is handed to st_lottie. With
+
+    [assets]
+    lottie_mode = "static"
+
+in secrets.toml, pages embed a small player that fetches the animation from
+file_server's /assets/<name>.json route instead, so browsers cache it rather
+than receiving it again with every rerun. Sizes before and after can be
+checked with:
+
+    python lottie_assets.py report
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import streamlit as st
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ANIMATIONS = {"sidebar": "animation1.json", "hero": "animation2.json"}
+PRECISION = 3
+LOTTIE_WEB_URL = "https://cdnjs.cloudflare.com/ajax/libs/lottie-web/5.12.2/lottie.min.js"
+
+# Editor-only metadata the players never read. Expressions look layers and
+# properties up by name (nm), match name (mn) and property index (ix), so
+# those are kept for animations that have any.
+STRIPPED_KEYS = {"cix", "np"}
+EXPRESSION_KEYS = {"nm", "mn", "ix"}
+
+
+def _has_expressions(value):
+    if isinstance(value, dict):
+        return isinstance(value.get("x"), str) or any(_has_expressions(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_expressions(item) for item in value)
+    return False
+
+
+def _compact(value, precision, stripped):
+    if isinstance(value, float):
+        value = round(value, precision)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, list):
+        return [_compact(item, precision, stripped) for item in value]
+    if isinstance(value, dict):
+        # hd defaults to false, so only hidden elements need to say so.
+        return {key: _compact(item, precision, stripped) for key, item in value.items()
+                if key not in stripped and not (key == "hd" and item is False)}
+    return value
+
+
+def _prune_layers(layers, comp_in, comp_out):
+    """Drop layers that never draw anything and that no other layer depends on."""
+    parents = {layer.get("parent") for layer in layers}
+    kept = []
+    for position, layer in enumerate(layers):
+        next_layer = layers[position + 1] if position + 1 < len(layers) else {}
+        needed = layer.get("ind") in parents or layer.get("td") or next_layer.get("tt")
+        invisible = (
+            layer.get("hd")
+            or layer.get("ip", comp_in) >= layer.get("op", comp_out)
+            or layer.get("op", comp_out) <= comp_in
+            or layer.get("ip", comp_in) >= comp_out
+        )
+        if invisible and not needed:
+            continue
+        kept.append(layer)
+    return kept
+
+
+def optimize(animation, precision=PRECISION):
+    """Return a smaller copy of a Lottie animation that renders the same."""
+    animation = dict(animation)
+    comp_in, comp_out = animation.get("ip", 0), animation.get("op", float("inf"))
+    animation["layers"] = _prune_layers(animation.get("layers", []), comp_in, comp_out)
+    # Precomp layers can start at any time, so only zero-length and hidden layers go from assets.
+    animation["assets"] = [
+        {**asset, "layers": _prune_layers(asset["layers"], float("-inf"), float("inf"))} if "layers" in asset else asset
+        for asset in animation.get("assets", [])
+    ]
+    used = {layer.get("refId") for layer in animation["layers"]}
+    for asset in animation["assets"]:
+        used.update(layer.get("refId") for layer in asset.get("layers", []))
+    animation["assets"] = [asset for asset in animation["assets"] if asset.get("id") in used]
+    stripped = STRIPPED_KEYS if _has_expressions(animation) else STRIPPED_KEYS | EXPRESSION_KEYS
+    return _compact(animation, precision, stripped)
+
+
+def serialize(animation):
+    return json.dumps(animation, separators=(",", ":"), ensure_ascii=False)
+
+
+def build(name, precision=PRECISION):
+    """{"data", "json", "etag", "original_size", "optimized_size"} for one named animation."""
+    with open(os.path.join(BASE_DIR, ANIMATIONS[name]), "rb") as f:
+        raw = f.read()
+    data = optimize(json.loads(raw), precision)
+    payload = serialize(data)
+    return {
+        "data": data,
+        "json": payload,
+        "etag": f'"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"',
+        "original_size": len(raw),
+        "optimized_size": len(payload.encode()),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def get_animation(name):
+    """The optimized animation, built once per process; None if the file is missing or invalid."""
+    try:
+        return build(name)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def player_html(url, height):
+    """A standalone lottie-web player for an animation the browser fetches (and caches) itself."""
+    return f"""
+<div id="lottie" style="height:{height}px"></div>
+<script src="{LOTTIE_WEB_URL}"></script>
+<script>
+  lottie.loadAnimation({{container: document.getElementById("lottie"), renderer: "svg",
+                         loop: true, autoplay: true, path: {json.dumps(url)}}});
+</script>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exam Buddy animation tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Show animation sizes before and after optimization.")
+    report.add_argument("--precision", type=int, default=PRECISION)
+    args = parser.parse_args()
+
+    for name, filename in ANIMATIONS.items():
+        asset = build(name, args.precision)
+        saved = 1 - asset["optimized_size"] / asset["original_size"]
+        print(f"{filename} ({name}): {asset['original_size'] / 1024:.0f} KB -> "
+              f"{asset['optimized_size'] / 1024:.0f} KB ({saved:.0%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Background expiry sweeps for time-limited aptitude tests and weekly quizzes.
+
+One daemon thread per Streamlit process wakes every sweep_interval seconds.
+Replicas elect a single leader through a lease row in scheduler_leases (see
+migrations/009_maintenance_scheduler.sql): only the lease holder deletes
+anything, and if it dies another replica takes over once the lease runs
+out. Every sweep is logged to maintenance_runs with its duration and the
+number of rows it removed. Settings live under [maintenance] in secrets.toml:
+
+    [maintenance]
+    sweep_interval = 300   # seconds between sweeps
+    lease_ttl = 900        # seconds a silent leader keeps the lease
+
+A sweep can also be run once by hand:
+
+    python maintenance.py sweep
+"""
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+import metrics
+from db import get_supabase
+
+EXPIRING_TABLES = ("aptitude_test", "weekly_quiz")
+LEASE_NAME = "expiry_sweep"
+
+_settings = st.secrets.get("maintenance", {})
+SWEEP_INTERVAL = float(_settings.get("sweep_interval", 300))
+LEASE_TTL = float(_settings.get("lease_ttl", 3 * SWEEP_INTERVAL))
+
+log = logging.getLogger(__name__)
+
+
+def acquire_lease(client, holder, name=LEASE_NAME, ttl=LEASE_TTL):
+    """Take the named lease, or renew it if holder already has it; True if holder owns it now."""
+    result = client.rpc("acquire_lease", {"p_name": name, "p_holder": holder, "p_ttl_seconds": int(ttl)}).execute()
+    return bool(result.data)
+
+
+def sweep_expired(client, tables=EXPIRING_TABLES):
+    """Delete expired rows; returns one {"table", "removed", "seconds", "error"} dict per table."""
+    # expire_at is written from naive local time by the admin upload forms.
+    now_iso = datetime.now().isoformat()
+    runs = []
+    for table in tables:
+        started = time.perf_counter()
+        removed, error = 0, None
+        try:
+            result = client.table(table).delete().lt("expire_at", now_iso).execute()
+            removed = len(result.data or [])
+        except Exception as e:
+            error = str(e)
+        seconds = time.perf_counter() - started
+        metrics.observe("expiry_sweep_seconds", seconds, table=table)
+        metrics.inc("expiry_sweep_rows_removed_total", removed, table=table)
+        runs.append({"table": table, "removed": removed, "seconds": seconds, "error": error})
+    return runs
+
+
+def record_runs(client, holder, runs):
+    client.table("maintenance_runs").insert([{
+        "task": f"expire:{run['table']}",
+        "holder": holder,
+        "seconds": run["seconds"],
+        "rows_removed": run["removed"],
+        "error": run["error"],
+    } for run in runs]).execute()
+
+
+class ExpirySweeper:
+    """Daemon thread that sweeps expired rows while this process holds the lease."""
+
+    def __init__(self, interval=SWEEP_INTERVAL, on_removed=None):
+        self.interval = interval
+        self.on_removed = on_removed
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.last_runs = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="expiry-sweeper", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        """Sweep if this process is the leader; returns the runs, or None when another replica leads."""
+        client = get_supabase()
+        if not acquire_lease(client, self.holder):
+            return None
+        runs = sweep_expired(client)
+        for run in runs:
+            if run["error"]:
+                log.warning("Expiry sweep of %s failed: %s", run["table"], run["error"])
+            elif run["removed"]:
+                log.info("Expiry sweep removed %d row(s) from %s in %.2fs", run["removed"], run["table"],
+                         run["seconds"])
+                if self.on_removed:
+                    self.on_removed(run["table"])
+        record_runs(client, self.holder, runs)
+        self.last_runs = runs
+        return runs
+
+    def _loop(self):
+        delay = 0
+        while not self._stop.wait(delay):
+            try:
+                self.run_once()
+            except Exception:
+                log.exception("Expiry sweep failed")
+            delay = self.interval
+
+
+@st.cache_resource(show_spinner=False)
+def start_expiry_sweeper(_on_removed=None):
+    """Start the process-wide sweeper once; later reruns and sessions get the same instance."""
+    return ExpirySweeper(on_removed=_on_removed).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exam Buddy maintenance tasks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("sweep", help="Delete expired aptitude tests and weekly quizzes now.")
+    parser.parse_args()
+
+    client = get_supabase()
+    for run in sweep_expired(client):
+        status = f"failed: {run['error']}" if run["error"] else f"{run['removed']} row(s) removed"
+        print(f"{run['table']}: {status} in {run['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
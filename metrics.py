@@ -0,0 +1,157 @@
+"""Process-wide counters and latency histograms in Prometheus text format.
+
+    with metrics.timer("preview_render_seconds", table="pdfs"):
+        ...
+    metrics.inc("cache_lookups_total", cache="pdfs", result="hit")
+
+Every series carries a process label (app or files). file_server.py serves
+its own registry at /metrics. The Streamlit process cannot add a route, so
+it rewrites a file for node_exporter's textfile collector instead; an empty
+textfile turns that off:
+
+    [metrics]
+    textfile = "metrics/app.prom"
+    interval = 15            # seconds between rewrites
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+_settings = st.secrets.get("metrics", {})
+TEXTFILE = _settings.get("textfile", "metrics/app.prom")
+TEXTFILE_INTERVAL = float(_settings.get("interval", 15))
+
+log = logging.getLogger(__name__)
+
+# Seconds; dense below one second, where Supabase calls and renders should stay.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "supabase_request_seconds": "Supabase REST and storage request latency by table and operation.",
+    "supabase_request_errors_total": "Supabase requests that failed or returned an error status.",
+    "blob_decode_seconds": "Time to read and decode a stored document.",
+    "preview_render_seconds": "Time to rasterize a preview page or thumbnail.",
+    "page_render_seconds": "Streamlit page render time.",
+    "cache_lookups_total": "Cache lookups by cache and result (hit or miss).",
+    "expiry_sweep_seconds": "Duration of expiry sweeps per table.",
+    "expiry_sweep_rows_removed_total": "Rows removed by expiry sweeps.",
+    "telemetry_events_spooled_total": "Telemetry events written to the local spool.",
+}
+
+
+class Registry:
+    def __init__(self, process):
+        self.process = process
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    def render(self):
+        """The registry in Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: {**value, "buckets": list(value["buckets"])} for key, value in self._histograms.items()}
+
+        lines = []
+        for kind, series in (("counter", counters), ("histogram", histograms)):
+            for name in sorted({name for name, _ in series}):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (series_name, labels), value in sorted(series.items()):
+                    if series_name != name:
+                        continue
+                    labels = (("process", self.process),) + labels
+                    if kind == "counter":
+                        lines.append(f"{name}{_labels(labels)} {value}")
+                        continue
+                    for bound, count in zip(BUCKETS, value["buckets"]):
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {value['count']}")
+                    lines.append(f"{name}_sum{_labels(labels)} {value['sum']:.6f}")
+                    lines.append(f"{name}_count{_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+# file_server.py renames its process to "files" at startup.
+registry = Registry("app")
+
+
+def inc(name, amount=1, **labels):
+    registry.inc(name, amount, **labels)
+
+
+def observe(name, seconds, **labels):
+    registry.observe(name, seconds, **labels)
+
+
+@contextmanager
+def timer(name, **labels):
+    """Observe how long the block took, including when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - started, **labels)
+
+
+def write_textfile(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(path + ".tmp", path)
+
+
+def start_textfile_writer(path, interval=15.0):
+    """Rewrite path with the current metrics every interval seconds on a daemon thread."""
+    def loop():
+        while True:
+            try:
+                write_textfile(path)
+            except OSError:
+                log.exception("Could not write metrics to %s", path)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="metrics-textfile", daemon=True)
+    thread.start()
+    return thread
+
+
+@st.cache_resource(show_spinner=False)
+def start_textfile_export():
+    """Start the textfile writer once per process, if a textfile is configured."""
+    if TEXTFILE:
+        return start_textfile_writer(TEXTFILE, TEXTFILE_INTERVAL)
+    return None
@@ -0,0 +1,9 @@
+-- Catalog listings select only metadata columns, so the file size has to live
+-- next to the metadata instead of being derived from the filedata blob.
+alter table pdfs add column if not exists size bigint;
+alter table subject_notes add column if not exists size bigint;
+alter table assignments add column if not exists size bigint;
+
+update pdfs set size = octet_length(decode(filedata, 'base64')) where size is null and filedata is not null;
+update subject_notes set size = octet_length(decode(filedata, 'base64')) where size is null and filedata is not null;
+update assignments set size = octet_length(decode(filedata, 'base64')) where size is null and filedata is not null;
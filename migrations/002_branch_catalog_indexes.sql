@@ -0,0 +1,41 @@
+-- Supports the single-query branch catalog lookup:
+--   pdfs?select=...,pdf_branches!inner(branch)&pdf_branches.branch=eq.X&regulation=eq.R...
+-- PostgREST needs the foreign key to embed pdf_branches, and the composite
+-- indexes let both sides of the join be resolved from the filter columns.
+
+-- Drop mappings left behind by papers that were deleted before the FK existed.
+delete from pdf_branches pb
+where not exists (select 1 from pdfs p where p.id = pb.pdf_id);
+
+-- Deleting a paper relies on the cascade, so an existing FK without it (under
+-- any name) is replaced rather than kept just because it exists.
+do $$
+declare
+    fk record;
+begin
+    for fk in
+        select conname from pg_constraint
+        where conrelid = 'pdf_branches'::regclass and confrelid = 'pdfs'::regclass
+          and contype = 'f' and confdeltype <> 'c'
+    loop
+        execute format('alter table pdf_branches drop constraint %I', fk.conname);
+    end loop;
+
+    if not exists (
+        select 1 from pg_constraint
+        where conrelid = 'pdf_branches'::regclass and confrelid = 'pdfs'::regclass
+          and contype = 'f' and confdeltype = 'c'
+    ) then
+        alter table pdf_branches
+            add constraint pdf_branches_pdf_id_fkey
+            foreign key (pdf_id) references pdfs (id) on delete cascade;
+    end if;
+end $$;
+
+create index if not exists pdf_branches_branch_pdf_id_idx
+    on pdf_branches (branch, pdf_id);
+
+create index if not exists pdfs_catalog_filter_idx
+    on pdfs (regulation, year, semester, type);
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,3 @@
+-- The file endpoint answers Last-Modified / If-Modified-Since from uploaded_at,
+-- which subject_notes and assignments already record but pdfs did not.
+alter table pdfs add column if not exists uploaded_at timestamptz not null default now();
@@ -0,0 +1,14 @@
+-- Document tables reference content-addressed blobs (see blob_store.py)
+-- instead of carrying base64 filedata. filedata stays nullable until
+-- `python blob_store.py migrate` has moved every row over.
+alter table pdfs add column if not exists blob_hash text;
+alter table subject_notes add column if not exists blob_hash text;
+alter table assignments add column if not exists blob_hash text;
+
+alter table pdfs alter column filedata drop not null;
+alter table subject_notes alter column filedata drop not null;
+alter table assignments alter column filedata drop not null;
+
+create index if not exists pdfs_blob_hash_idx on pdfs (blob_hash);
+create index if not exists subject_notes_blob_hash_idx on subject_notes (blob_hash);
+create index if not exists assignments_blob_hash_idx on assignments (blob_hash);
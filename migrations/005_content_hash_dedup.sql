@@ -0,0 +1,66 @@
+-- Shared-blob model: every stored file is registered once in blobs, keyed by
+-- the SHA-256 of its content, and documents reference it by blob_hash.
+-- Duplicates are defined by content + metadata instead of filename.
+
+create table if not exists blobs (
+    hash text primary key,
+    size bigint not null,
+    created_at timestamptz not null default now()
+);
+
+insert into blobs (hash, size)
+select blob_hash, max(coalesce(size, 0)) from (
+    select blob_hash, size from pdfs
+    union all select blob_hash, size from subject_notes
+    union all select blob_hash, size from assignments
+) docs
+where blob_hash is not null
+group by blob_hash
+on conflict (hash) do nothing;
+
+alter table pdfs drop constraint if exists pdfs_blob_hash_fkey;
+alter table pdfs add constraint pdfs_blob_hash_fkey foreign key (blob_hash) references blobs (hash);
+alter table subject_notes drop constraint if exists subject_notes_blob_hash_fkey;
+alter table subject_notes add constraint subject_notes_blob_hash_fkey foreign key (blob_hash) references blobs (hash);
+alter table assignments drop constraint if exists assignments_blob_hash_fkey;
+alter table assignments add constraint assignments_blob_hash_fkey foreign key (blob_hash) references blobs (hash);
+
+-- Branch mappings are upserted when an existing paper is uploaded for more branches.
+delete from pdf_branches a using pdf_branches b
+where a.pdf_id = b.pdf_id and a.branch = b.branch and a.ctid > b.ctid;
+create unique index if not exists pdf_branches_pdf_id_branch_key on pdf_branches (pdf_id, branch);
+
+-- Fold existing content duplicates into the oldest row before enforcing uniqueness.
+create temporary table pdf_duplicates as
+select id, first_value(id) over (
+    partition by blob_hash, regulation, year, semester, type order by id
+) as keeper
+from pdfs where blob_hash is not null;
+
+insert into pdf_branches (pdf_id, branch)
+select d.keeper, pb.branch
+from pdf_duplicates d join pdf_branches pb on pb.pdf_id = d.id
+where d.id <> d.keeper
+on conflict (pdf_id, branch) do nothing;
+
+delete from pdfs p using pdf_duplicates d where p.id = d.id and d.id <> d.keeper;
+drop table pdf_duplicates;
+
+delete from subject_notes a using subject_notes b
+where a.blob_hash = b.blob_hash and a.subject = b.subject and a.regulation = b.regulation
+  and a.year = b.year and a.id > b.id;
+
+delete from assignments a using assignments b
+where a.blob_hash = b.blob_hash and a.branch = b.branch and a.year = b.year
+  and a.semester = b.semester and a.subject = b.subject and a.unit = b.unit and a.id > b.id;
+
+create unique index if not exists pdfs_content_key
+    on pdfs (blob_hash, regulation, year, semester, type);
+create unique index if not exists subject_notes_content_key
+    on subject_notes (blob_hash, subject, regulation, year);
+create unique index if not exists assignments_content_key
+    on assignments (blob_hash, branch, year, semester, subject, unit);
+
+drop index if exists pdfs_blob_hash_idx;
+drop index if exists subject_notes_blob_hash_idx;
+drop index if exists assignments_blob_hash_idx;
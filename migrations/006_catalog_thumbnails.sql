@@ -0,0 +1,9 @@
+-- Upload-time catalog metadata: page count and the blob hash of a small
+-- first-page JPEG served from file_server's /thumbs route.
+-- Existing rows are filled in by `python preview.py backfill`.
+alter table pdfs add column if not exists page_count integer;
+alter table pdfs add column if not exists thumb_hash text;
+alter table subject_notes add column if not exists page_count integer;
+alter table subject_notes add column if not exists thumb_hash text;
+alter table assignments add column if not exists page_count integer;
+alter table assignments add column if not exists thumb_hash text;
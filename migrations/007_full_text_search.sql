@@ -0,0 +1,82 @@
+-- Full-text index over document content extracted at upload time
+-- (search_index.extract_text). Filenames and subjects weigh more than body text.
+
+alter table pdfs add column if not exists content_text text;
+alter table subject_notes add column if not exists content_text text;
+alter table assignments add column if not exists content_text text;
+
+alter table pdfs add column if not exists search_vector tsvector generated always as (
+    setweight(to_tsvector('english', coalesce(filename, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(content_text, '')), 'B')
+) stored;
+alter table subject_notes add column if not exists search_vector tsvector generated always as (
+    setweight(to_tsvector('english', coalesce(subject, '') || ' ' || coalesce(filename, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(content_text, '')), 'B')
+) stored;
+alter table assignments add column if not exists search_vector tsvector generated always as (
+    setweight(to_tsvector('english', coalesce(subject, '') || ' ' || coalesce(filename, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(content_text, '')), 'B')
+) stored;
+
+create index if not exists pdfs_search_idx on pdfs using gin (search_vector);
+create index if not exists subject_notes_search_idx on subject_notes using gin (search_vector);
+create index if not exists assignments_search_idx on assignments using gin (search_vector);
+
+-- Ranked search across all document tables. Null filters are ignored; filters
+-- that do not apply to a table (e.g. branch for subject notes) skip that table.
+create or replace function search_documents(
+    p_query text,
+    p_table text default null,
+    p_branch text default null,
+    p_regulation text default null,
+    p_year text default null,
+    p_semester text default null,
+    p_limit integer default 50
+) returns table (doc_table text, id text, filename text, rank real, snippet text)
+language sql stable as $$
+    with q as (
+        select websearch_to_tsquery('english', p_query) as query
+    ),
+    hits as (
+        select 'pdfs'::text as doc_table, p.id::text as id, p.filename, p.content_text,
+               ts_rank_cd(p.search_vector, q.query) as rank
+        from pdfs p, q
+        where (p_table is null or p_table = 'pdfs')
+          and p.search_vector @@ q.query
+          and (p_regulation is null or p.regulation = p_regulation)
+          and (p_year is null or p.year = p_year)
+          and (p_semester is null or p.semester = p_semester)
+          and (p_branch is null or exists (
+              select 1 from pdf_branches pb where pb.pdf_id = p.id and pb.branch = p_branch))
+        union all
+        select 'subject_notes', n.id::text, n.filename, n.content_text,
+               ts_rank_cd(n.search_vector, q.query)
+        from subject_notes n, q
+        where (p_table is null or p_table = 'subject_notes')
+          and p_branch is null and p_semester is null
+          and n.search_vector @@ q.query
+          and (p_regulation is null or n.regulation = p_regulation)
+          and (p_year is null or n.year = p_year)
+        union all
+        select 'assignments', a.id::text, a.filename, a.content_text,
+               ts_rank_cd(a.search_vector, q.query)
+        from assignments a, q
+        where (p_table is null or p_table = 'assignments')
+          and p_regulation is null
+          and a.search_vector @@ q.query
+          and (p_branch is null or a.branch = p_branch)
+          and (p_year is null or a.year = p_year)
+          and (p_semester is null or a.semester = p_semester)
+    ),
+    top as (
+        select * from hits order by rank desc limit p_limit
+    )
+    -- Headlines are only built for the rows that are returned.
+    select top.doc_table, top.id, top.filename, top.rank,
+           ts_headline('english', coalesce(top.content_text, ''), q.query,
+                       'MaxFragments=1, MinWords=8, MaxWords=20')
+    from top, q
+    order by top.rank desc;
+$$;
+
+notify pgrst, 'reload schema';
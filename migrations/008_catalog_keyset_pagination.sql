@@ -0,0 +1,15 @@
+-- Supports keyset pagination of the catalog pages:
+--   ...&order=id.desc&id=lt.<cursor>&limit=13
+-- Each index ends in id so a page is read in order straight from the index
+-- after the equality filters, however deep the cursor is.
+
+create index if not exists pdfs_catalog_page_idx
+    on pdfs (regulation, year, semester, type, id desc);
+
+drop index if exists pdfs_catalog_filter_idx;
+
+create index if not exists subject_notes_catalog_page_idx
+    on subject_notes (regulation, year, id desc);
+
+create index if not exists assignments_catalog_page_idx
+    on assignments (branch, year, semester, unit, id desc);
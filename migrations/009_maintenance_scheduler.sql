@@ -0,0 +1,48 @@
+-- Leader election and run log for the background expiry sweeper (maintenance.py).
+-- Advisory locks would be released as soon as PostgREST returns the pooled
+-- connection, so leadership is a lease row that the leader renews each sweep.
+
+create table if not exists scheduler_leases (
+    name text primary key,
+    holder text not null,
+    expires_at timestamptz not null
+);
+
+create table if not exists maintenance_runs (
+    id bigint generated always as identity primary key,
+    task text not null,
+    holder text not null,
+    started_at timestamptz not null default now(),
+    seconds double precision not null,
+    rows_removed integer not null default 0,
+    error text
+);
+
+create index if not exists maintenance_runs_started_at_idx
+    on maintenance_runs (started_at desc);
+
+-- Takes the lease if it is free or expired, renews it for its current holder,
+-- and otherwise leaves it alone. The upsert makes concurrent callers race on
+-- the primary key, so at most one of them gets true.
+create or replace function acquire_lease(p_name text, p_holder text, p_ttl_seconds integer)
+returns boolean
+language plpgsql
+as $$
+declare
+    v_holder text;
+begin
+    insert into scheduler_leases as l (name, holder, expires_at)
+    values (p_name, p_holder, now() + make_interval(secs => p_ttl_seconds))
+    on conflict (name) do update
+        set holder = excluded.holder,
+            expires_at = excluded.expires_at
+        where l.holder = excluded.holder or l.expires_at < now()
+    returning holder into v_holder;
+    return coalesce(v_holder = p_holder, false);
+end;
+$$;
+
+create index if not exists weekly_quiz_expire_at_idx on weekly_quiz (expire_at);
+create index if not exists aptitude_test_expire_at_idx on aptitude_test (expire_at);
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,22 @@
+-- One-row-per-table counts for the admin dashboard, read in a single request:
+--   catalog_stats?select=*
+-- Counts run on the server (index-only scans on the primary keys), so the
+-- dashboard transfers five rows however large the catalog grows.
+
+create or replace view catalog_stats as
+select 'pdfs' as table_name, count(*) as total, count(*) as active, coalesce(sum(size), 0) as total_bytes
+from pdfs
+union all
+select 'subject_notes', count(*), count(*), coalesce(sum(size), 0)
+from subject_notes
+union all
+select 'assignments', count(*), count(*), coalesce(sum(size), 0)
+from assignments
+union all
+select 'weekly_quiz', count(*), count(*) filter (where expire_at is null or expire_at > now()), 0
+from weekly_quiz
+union all
+select 'aptitude_test', count(*), count(*) filter (where expire_at is null or expire_at > now()), 0
+from aptitude_test;
+
+notify pgrst, 'reload schema';
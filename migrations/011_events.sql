@@ -0,0 +1,45 @@
+-- Usage events written in batches by telemetry.py and file_server.py.
+
+create table if not exists events (
+    id bigint generated always as identity primary key,
+    event_type text not null check (event_type in ('preview', 'download', 'search')),
+    table_name text,
+    doc_id text,
+    session_id text,
+    query text,
+    results integer,
+    occurred_at timestamptz not null default now()
+);
+
+create index if not exists events_type_occurred_at_idx on events (event_type, occurred_at desc);
+create index if not exists events_document_idx on events (table_name, doc_id);
+
+-- Extends catalog_stats with documents uploaded in the last 7 days and
+-- with event totals, so the home page and dashboard still need one request.
+create or replace view catalog_stats as
+select 'pdfs' as table_name, count(*) as total, count(*) as active, coalesce(sum(size), 0) as total_bytes,
+       count(*) filter (where uploaded_at > now() - interval '7 days') as recent
+from pdfs
+union all
+select 'subject_notes', count(*), count(*), coalesce(sum(size), 0),
+       count(*) filter (where uploaded_at > now() - interval '7 days')
+from subject_notes
+union all
+select 'assignments', count(*), count(*), coalesce(sum(size), 0),
+       count(*) filter (where uploaded_at > now() - interval '7 days')
+from assignments
+union all
+select 'weekly_quiz', count(*), count(*) filter (where expire_at is null or expire_at > now()), 0,
+       count(*) filter (where uploaded_at > now() - interval '7 days')
+from weekly_quiz
+union all
+select 'aptitude_test', count(*), count(*) filter (where expire_at is null or expire_at > now()), 0,
+       count(*) filter (where uploaded_at > now() - interval '7 days')
+from aptitude_test
+union all
+select event_type, count(*), count(*), 0,
+       count(*) filter (where occurred_at > now() - interval '7 days')
+from events
+group by event_type;
+
+notify pgrst, 'reload schema';
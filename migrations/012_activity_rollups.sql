@@ -0,0 +1,172 @@
+-- Day and month activity counts for the dashboard trend chart, kept up to
+-- date by statement-level triggers so the chart never scans uploaded_at:
+--   activity_rollups?granularity=eq.month&branch=eq.&bucket=gte.2026-01-01
+--
+-- metric is 'uploads' or 'deletes' for the document tables and the event
+-- type ('download', 'preview', 'search') for telemetry. branch = '' holds
+-- the total over all branches; rows with a branch break that total down
+-- (question papers through pdf_branches, assignments through their branch
+-- column), so never sum across both. doc_type is the paper type for pdfs and
+-- '' elsewhere. Deletes are only broken down by table and type.
+--
+-- Transition tables let one multi-row insert (an ingest batch, a telemetry
+-- flush) cost one aggregated upsert instead of one per row.
+
+begin;
+
+create table if not exists activity_rollups (
+    granularity text not null check (granularity in ('day', 'month')),
+    bucket date not null,
+    table_name text not null,
+    branch text not null default '',
+    doc_type text not null default '',
+    metric text not null,
+    count bigint not null default 0,
+    primary key (granularity, bucket, table_name, branch, doc_type, metric)
+);
+
+-- p_rows is a jsonb array of {at, table_name, branch, doc_type, metric, delta}; each row is
+-- counted in both its day and its month bucket.
+create or replace function add_rollups(p_rows jsonb)
+returns void
+language sql
+as $$
+    insert into activity_rollups as r (granularity, bucket, table_name, branch, doc_type, metric, count)
+    select g.granularity, date_trunc(g.granularity, d.at)::date, d.table_name, d.branch, d.doc_type, d.metric,
+           sum(d.delta)
+    from jsonb_to_recordset(p_rows)
+             as d(at timestamptz, table_name text, branch text, doc_type text, metric text, delta bigint)
+    cross join (values ('day'), ('month')) as g(granularity)
+    group by 1, 2, 3, 4, 5, 6
+    on conflict (granularity, bucket, table_name, branch, doc_type, metric)
+        do update set count = r.count + excluded.count;
+$$;
+
+create or replace function rollup_pdfs_insert()
+returns trigger language plpgsql as $$
+begin
+    perform add_rollups((select coalesce(jsonb_agg(x), '[]') from (
+        select uploaded_at as at, 'pdfs' as table_name, '' as branch, coalesce(type, '') as doc_type,
+               'uploads' as metric, 1 as delta
+        from inserted) x));
+    return null;
+end;
+$$;
+
+create or replace function rollup_pdf_branches_insert()
+returns trigger language plpgsql as $$
+begin
+    perform add_rollups((select coalesce(jsonb_agg(x), '[]') from (
+        select now() as at, 'pdfs' as table_name, i.branch, coalesce(p.type, '') as doc_type,
+               'uploads' as metric, 1 as delta
+        from inserted i left join pdfs p on p.id = i.pdf_id) x));
+    return null;
+end;
+$$;
+
+create or replace function rollup_assignments_insert()
+returns trigger language plpgsql as $$
+begin
+    perform add_rollups((select coalesce(jsonb_agg(x), '[]') from (
+        select coalesce(uploaded_at::timestamptz, now()) as at, 'assignments' as table_name, '' as branch,
+               '' as doc_type, 'uploads' as metric, 1 as delta
+        from inserted
+        union all
+        select coalesce(uploaded_at::timestamptz, now()), 'assignments', branch, '', 'uploads', 1
+        from inserted where coalesce(branch, '') <> '') x));
+    return null;
+end;
+$$;
+
+create or replace function rollup_subject_notes_insert()
+returns trigger language plpgsql as $$
+begin
+    perform add_rollups((select coalesce(jsonb_agg(x), '[]') from (
+        select coalesce(uploaded_at::timestamptz, now()) as at, 'subject_notes' as table_name, '' as branch,
+               '' as doc_type, 'uploads' as metric, 1 as delta
+        from inserted) x));
+    return null;
+end;
+$$;
+
+create or replace function rollup_documents_delete()
+returns trigger language plpgsql as $$
+begin
+    perform add_rollups((select coalesce(jsonb_agg(x), '[]') from (
+        select now() as at, TG_TABLE_NAME::text as table_name, '' as branch,
+               case when TG_TABLE_NAME = 'pdfs' then coalesce(to_jsonb(d) ->> 'type', '') else '' end as doc_type,
+               'deletes' as metric, 1 as delta
+        from deleted d) x));
+    return null;
+end;
+$$;
+
+create or replace function rollup_events_insert()
+returns trigger language plpgsql as $$
+begin
+    perform add_rollups((select coalesce(jsonb_agg(x), '[]') from (
+        select occurred_at as at, coalesce(table_name, '') as table_name, '' as branch, '' as doc_type,
+               event_type as metric, 1 as delta
+        from inserted) x));
+    return null;
+end;
+$$;
+
+drop trigger if exists pdfs_rollup_insert on pdfs;
+create trigger pdfs_rollup_insert after insert on pdfs
+    referencing new table as inserted for each statement execute function rollup_pdfs_insert();
+
+drop trigger if exists pdf_branches_rollup_insert on pdf_branches;
+create trigger pdf_branches_rollup_insert after insert on pdf_branches
+    referencing new table as inserted for each statement execute function rollup_pdf_branches_insert();
+
+drop trigger if exists subject_notes_rollup_insert on subject_notes;
+create trigger subject_notes_rollup_insert after insert on subject_notes
+    referencing new table as inserted for each statement execute function rollup_subject_notes_insert();
+
+drop trigger if exists assignments_rollup_insert on assignments;
+create trigger assignments_rollup_insert after insert on assignments
+    referencing new table as inserted for each statement execute function rollup_assignments_insert();
+
+drop trigger if exists pdfs_rollup_delete on pdfs;
+create trigger pdfs_rollup_delete after delete on pdfs
+    referencing old table as deleted for each statement execute function rollup_documents_delete();
+
+drop trigger if exists subject_notes_rollup_delete on subject_notes;
+create trigger subject_notes_rollup_delete after delete on subject_notes
+    referencing old table as deleted for each statement execute function rollup_documents_delete();
+
+drop trigger if exists assignments_rollup_delete on assignments;
+create trigger assignments_rollup_delete after delete on assignments
+    referencing old table as deleted for each statement execute function rollup_documents_delete();
+
+drop trigger if exists events_rollup_insert on events;
+create trigger events_rollup_insert after insert on events
+    referencing new table as inserted for each statement execute function rollup_events_insert();
+
+-- Backfill from what is already stored; deletes before this point are not known.
+delete from activity_rollups;
+
+select add_rollups((select coalesce(jsonb_agg(x), '[]') from (
+    select uploaded_at as at, 'pdfs' as table_name, '' as branch, coalesce(type, '') as doc_type,
+           'uploads' as metric, 1 as delta
+    from pdfs
+    union all
+    select p.uploaded_at, 'pdfs', pb.branch, coalesce(p.type, ''), 'uploads', 1
+    from pdf_branches pb join pdfs p on p.id = pb.pdf_id
+    union all
+    select coalesce(uploaded_at::timestamptz, now()), 'subject_notes', '', '', 'uploads', 1
+    from subject_notes
+    union all
+    select coalesce(uploaded_at::timestamptz, now()), 'assignments', '', '', 'uploads', 1
+    from assignments
+    union all
+    select coalesce(uploaded_at::timestamptz, now()), 'assignments', branch, '', 'uploads', 1
+    from assignments where coalesce(branch, '') <> ''
+    union all
+    select occurred_at, coalesce(table_name, ''), '', '', event_type, 1
+    from events) x));
+
+commit;
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,34 @@
+-- Register thumbnails in blobs like the files they preview, and reference
+-- them by foreign key from thumb_hash. release_blobs() then cannot delete a
+-- thumbnail that a concurrent upload of the same first page is reusing: the
+-- foreign key refuses the blobs delete instead of the race being lost.
+--
+-- The sizes of thumbnails stored before this migration are not known here
+-- and are recorded as 0.
+
+begin;
+
+insert into blobs (hash, size)
+select thumb_hash, 0 from (
+    select thumb_hash from pdfs
+    union select thumb_hash from subject_notes
+    union select thumb_hash from assignments
+) thumbs
+where thumb_hash is not null
+on conflict (hash) do nothing;
+
+alter table pdfs drop constraint if exists pdfs_thumb_hash_fkey;
+alter table pdfs add constraint pdfs_thumb_hash_fkey foreign key (thumb_hash) references blobs (hash);
+alter table subject_notes drop constraint if exists subject_notes_thumb_hash_fkey;
+alter table subject_notes add constraint subject_notes_thumb_hash_fkey foreign key (thumb_hash) references blobs (hash);
+alter table assignments drop constraint if exists assignments_thumb_hash_fkey;
+alter table assignments add constraint assignments_thumb_hash_fkey foreign key (thumb_hash) references blobs (hash);
+
+-- release_blobs() looks documents up by thumb_hash, and the foreign keys check it on every blobs delete.
+create index if not exists pdfs_thumb_hash_idx on pdfs (thumb_hash);
+create index if not exists subject_notes_thumb_hash_idx on subject_notes (thumb_hash);
+create index if not exists assignments_thumb_hash_idx on assignments (thumb_hash);
+
+commit;
+
+notify pgrst, 'reload schema';
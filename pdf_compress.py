@@ -0,0 +1,190 @@
+"""PDF compression engine for admin uploads.
+
+compress_pdf() first rewrites the document losslessly with PyMuPDF (garbage
+collection, stream deflate, in-place downsampling of oversized images). It
+then looks at each page and rasterizes a page to JPEG only when that page
+has no text layer and the raster is clearly smaller, so text pages keep
+their fonts and stay searchable. The report lists size and time per page.
+
+Documents of up to IN_PROCESS_PAGES pages are analyzed in-process: a worker
+costs an interpreter start plus a PyMuPDF import, more than a short paper's
+pages. Longer documents are split across one process pool that is created on
+first use and shared by every upload thread.
+
+PyMuPDF is not thread-safe. Callers that share it across threads pass their
+lock, which is held only while this process touches a document and never
+while waiting on the pool.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from multiprocessing import get_context
+
+import fitz  # PyMuPDF
+
+IMAGE_DPI_THRESHOLD = 200
+IMAGE_DPI_TARGET = 150
+RASTER_DPI = 110
+JPEG_QUALITY = 60
+MIN_RASTER_GAIN = 0.25
+SAVE_OPTIONS = dict(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, clean=True)
+IN_PROCESS_PAGES = 16
+POOL_WORKERS = os.cpu_count() or 1
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn keeps the Streamlit server's threads out of the workers.
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(broken):
+    """Drop a broken pool so the next _get_pool() starts a new one, unless another thread already did."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _analyze_in_pool(pdf_bytes, batches, dpi, quality, min_gain):
+    """Analyze page batches on the shared pool, once more on a new pool if a worker died."""
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            futures = [pool.submit(_analyze_pages, pdf_bytes, batch, dpi, quality, min_gain) for batch in batches]
+            return [page for future in futures for page in future.result()]
+        except BrokenProcessPool:
+            # A dead worker (OOM-killed, crashed in MuPDF) breaks the pool for every later upload too.
+            _reset_pool(pool)
+            if attempt:
+                raise
+
+
+def _downsample_images(doc, dpi_threshold, dpi_target, quality):
+    if hasattr(doc, "rewrite_images"):
+        doc.rewrite_images(dpi_threshold=dpi_threshold, dpi_target=dpi_target, quality=quality)
+        return
+
+    # Older PyMuPDF: shrink each oversized image by the power of two closest to the target.
+    done = set()
+    for page in doc:
+        for image in page.get_images(full=True):
+            xref = image[0]
+            if xref in done:
+                continue
+            done.add(xref)
+            rects = page.get_image_rects(xref)
+            if not rects or rects[0].width <= 0:
+                continue
+            pix = fitz.Pixmap(doc, xref)
+            effective_dpi = pix.width / (rects[0].width / 72)
+            if effective_dpi <= dpi_threshold:
+                continue
+            factor = 0
+            while effective_dpi / (2 ** (factor + 1)) >= dpi_target:
+                factor += 1
+            if pix.alpha or pix.n - pix.alpha not in (1, 3):
+                continue
+            if factor:
+                pix.shrink(factor)
+            page.replace_image(xref, stream=pix.tobytes("jpg", jpg_quality=quality))
+
+
+def optimize_lossless(pdf_bytes, dpi_threshold=IMAGE_DPI_THRESHOLD, dpi_target=IMAGE_DPI_TARGET,
+                      quality=JPEG_QUALITY):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        _downsample_images(doc, dpi_threshold, dpi_target, quality)
+        return doc.tobytes(**SAVE_OPTIONS)
+
+
+def _single_page_size(doc, page_number):
+    with fitz.open() as single:
+        single.insert_pdf(doc, from_page=page_number, to_page=page_number)
+        return len(single.tobytes(**SAVE_OPTIONS))
+
+
+def _analyze_pages(pdf_bytes, page_numbers, dpi, quality, min_gain):
+    """Worker: measure each page and return a raster replacement where it pays off."""
+    results = []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page_number in page_numbers:
+            started = time.perf_counter()
+            page = doc[page_number]
+            before = _single_page_size(doc, page_number)
+            raster = None
+            if not page.get_text("text").strip():
+                jpeg = page.get_pixmap(dpi=dpi).tobytes("jpg", jpg_quality=quality)
+                if len(jpeg) < before * (1 - min_gain):
+                    raster = jpeg
+            results.append({
+                "page": page_number + 1,
+                "action": "rasterized" if raster else "kept",
+                "before": before,
+                "after": len(raster) if raster else before,
+                "seconds": time.perf_counter() - started,
+                "raster": raster,
+            })
+    return results
+
+
+def _chunks(items, count):
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def compress_pdf(pdf_bytes, dpi=RASTER_DPI, quality=JPEG_QUALITY, min_gain=MIN_RASTER_GAIN,
+                 in_process_pages=IN_PROCESS_PAGES, lock=None):
+    """Return (compressed_bytes, report). The original bytes are returned if nothing got smaller."""
+    lock = lock or nullcontext()
+    started = time.perf_counter()
+    with lock:
+        optimized = optimize_lossless(pdf_bytes, quality=quality)
+        lossless_seconds = time.perf_counter() - started
+        with fitz.open(stream=optimized, filetype="pdf") as doc:
+            page_count = doc.page_count
+    workers = 1 if page_count <= in_process_pages else min(POOL_WORKERS, page_count)
+    pages = []
+    if page_count:
+        if workers == 1:
+            with lock:
+                pages = _analyze_pages(optimized, list(range(page_count)), dpi, quality, min_gain)
+        else:
+            pages = _analyze_in_pool(optimized, _chunks(list(range(page_count)), workers), dpi, quality, min_gain)
+
+    result = optimized
+    if any(page["raster"] for page in pages):
+        with lock, fitz.open(stream=optimized, filetype="pdf") as source, fitz.open() as out:
+            for page in pages:
+                index = page["page"] - 1
+                if page["raster"]:
+                    rect = source[index].rect
+                    out.new_page(width=rect.width, height=rect.height).insert_image(rect, stream=page["raster"])
+                else:
+                    out.insert_pdf(source, from_page=index, to_page=index)
+            result = out.tobytes(**SAVE_OPTIONS)
+
+    if len(result) >= len(pdf_bytes):
+        result = pdf_bytes
+
+    for page in pages:
+        del page["raster"]
+    report = {
+        "original_size": len(pdf_bytes),
+        "lossless_size": len(optimized),
+        "final_size": len(result),
+        "lossless_seconds": lossless_seconds,
+        "total_seconds": time.perf_counter() - started,
+        "workers": workers,
+        "pages": pages,
+    }
+    return result, report
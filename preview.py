@@ -0,0 +1,149 @@
+"""Page-by-page PDF previews rendered to JPEG with PyMuPDF.
+
+Rendered pages are cached process-wide by (table, document id, page, dpi)
+under a byte budget, as are the source documents they are rendered from, so
+a student only ever receives the page images they look at.
+
+First-page thumbnails and page counts are extracted once at upload time and
+stored as catalog metadata; rows uploaded before that can be filled in with:
+
+    python preview.py backfill [--table pdfs]
+"""
+import argparse
+import threading
+
+import fitz  # PyMuPDF
+import streamlit as st
+
+from blob_store import DOCUMENT_TABLES, get_blob_store, load_row_bytes, register_blobs
+from byte_cache import ByteBudgetCache
+from db import get_supabase
+import metrics
+
+PREVIEW_DPI = 100
+JPEG_QUALITY = 70
+THUMBNAIL_WIDTH = 180
+THUMBNAIL_QUALITY = 60
+PAGE_CACHE_BUDGET = 96 * 1024 * 1024
+DOCUMENT_CACHE_BUDGET = 128 * 1024 * 1024
+
+# PyMuPDF is not thread-safe, and Streamlit sessions and the ingest pool are threads.
+fitz_lock = threading.Lock()
+
+
+@st.cache_resource(show_spinner=False)
+def _page_cache():
+    return ByteBudgetCache(PAGE_CACHE_BUDGET, name="preview_pages")
+
+
+@st.cache_resource(show_spinner=False)
+def _document_cache():
+    return ByteBudgetCache(DOCUMENT_CACHE_BUDGET, sizeof=lambda doc: len(doc["data"]), name="preview_documents")
+
+
+def load_document(table, doc_id):
+    """Return {"data": pdf bytes, "pages": page count}, or None if the document is gone."""
+    key = (table, doc_id)
+    doc = _document_cache().get(key)
+    if doc is None:
+        result = get_supabase().table(table).select("blob_hash, filedata").eq("id", doc_id).limit(1).execute()
+        data = load_row_bytes(result.data[0]) if result.data else None
+        if data is None:
+            return None
+        with fitz_lock, fitz.open(stream=data, filetype="pdf") as pdf:
+            doc = {"data": data, "pages": pdf.page_count}
+        _document_cache().put(key, doc)
+    return doc
+
+
+def page_count(table, doc_id):
+    doc = load_document(table, doc_id)
+    return doc["pages"] if doc else 0
+
+
+def render_page(table, doc_id, page_number, dpi=PREVIEW_DPI):
+    """Return one page (0-based) of a document as JPEG bytes."""
+    key = (table, doc_id, page_number, dpi)
+    image = _page_cache().get(key)
+    if image is None:
+        doc = load_document(table, doc_id)
+        if doc is None or not 0 <= page_number < doc["pages"]:
+            return None
+        with metrics.timer("preview_render_seconds", kind="page"), fitz_lock, \
+                fitz.open(stream=doc["data"], filetype="pdf") as pdf:
+            image = pdf[page_number].get_pixmap(dpi=dpi).tobytes("jpg", jpg_quality=JPEG_QUALITY)
+        _page_cache().put(key, image)
+    return image
+
+
+def forget_document(table, doc_id):
+    """Drop a document and its rendered pages from the caches, e.g. after it is deleted."""
+    _document_cache().discard((table, doc_id))
+    _page_cache().discard_prefix((table, doc_id))
+
+
+def first_page_thumbnail(pdf_bytes, width=THUMBNAIL_WIDTH):
+    """Return (jpeg bytes, page count) for a PDF, or (None, None) if it cannot be parsed."""
+    try:
+        with metrics.timer("preview_render_seconds", kind="thumbnail"), fitz_lock, \
+                fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+            if not pdf.page_count:
+                return None, 0
+            page = pdf[0]
+            zoom = width / page.rect.width
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            return pixmap.tobytes("jpg", jpg_quality=THUMBNAIL_QUALITY), pdf.page_count
+    except Exception:
+        return None, None
+
+
+def catalog_metadata(pdf_bytes):
+    """Upload-time catalog fields (stored thumbnail hash and page count), plus the thumbnail bytes or None.
+
+    The thumbnail must be registered (blob_store.register_blobs) before the
+    fields are written, since thumb_hash references blobs.
+    """
+    thumbnail, pages = first_page_thumbnail(pdf_bytes)
+    thumb_hash = get_blob_store().put(thumbnail) if thumbnail else None
+    return {"thumb_hash": thumb_hash, "page_count": pages}, thumbnail
+
+
+def backfill_table(client, table, batch_size=20):
+    """Fill thumb_hash and page_count for rows uploaded before they were extracted."""
+    done = 0
+    failed = set()
+    while True:
+        query = client.table(table).select("id, blob_hash, filedata").is_("page_count", "null")
+        if failed:
+            query = query.not_.in_("id", sorted(failed))
+        rows = query.limit(batch_size).execute().data or []
+        if not rows:
+            return done
+        for row in rows:
+            data = load_row_bytes(row)
+            metadata, thumbnail = catalog_metadata(data) if data else ({"page_count": None}, None)
+            if metadata["page_count"] is None:
+                failed.add(row["id"])
+                continue
+            if thumbnail:
+                register_blobs(client, get_blob_store(), {metadata["thumb_hash"]: thumbnail})
+            client.table(table).update(metadata).eq("id", row["id"]).execute()
+            done += 1
+        print(f"{table}: {done} row(s) updated")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exam Buddy preview tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    backfill = sub.add_parser("backfill", help="Extract thumbnails and page counts for existing rows.")
+    backfill.add_argument("--table", choices=DOCUMENT_TABLES, action="append")
+    backfill.add_argument("--batch", type=int, default=20)
+    args = parser.parse_args()
+
+    client = get_supabase()
+    for table in args.table or DOCUMENT_TABLES:
+        print(f"{table}: done, {backfill_table(client, table, args.batch)} row(s) updated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""On-demand cProfile of page renders for admins.
+
+An admin arms the profiler from the sidebar for one page and a number of
+reruns. The next renders of that page in the admin's own session each run
+under cProfile and are saved as <timestamp>-<page>.prof. Only one render is
+profiled at a time per process: from Python 3.12 cProfile sits on the
+process-wide sys.monitoring and a second enable() fails. A render that
+finds the profiler busy runs unprofiled and keeps its turn. The admin panel lists the
+saved profiles with their top cumulative hotspots and offers the raw .prof
+file and a collapsed-stacks export for flamegraph.pl or speedscope.
+Settings live under [profiler] in secrets.toml:
+
+    [profiler]
+    dir = "profiles"
+    keep = 50                # oldest profiles are deleted beyond this
+"""
+import cProfile
+import logging
+import os
+import pstats
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+_settings = st.secrets.get("profiler", {})
+PROFILE_DIR = _settings.get("dir", "profiles")
+KEEP = int(_settings.get("keep", 50))
+# Collapsed stacks below one microsecond are noise for a flamegraph.
+MIN_STACK_MICROSECONDS = 1
+
+log = logging.getLogger(__name__)
+
+_profiling = threading.Lock()
+
+
+def arm(page, reruns):
+    st.session_state.profile_page = page
+    st.session_state.profile_remaining = reruns
+
+
+def disarm():
+    st.session_state.profile_remaining = 0
+
+
+def remaining(page=None):
+    """Profiled renders left in this session, for page if given."""
+    if page is not None and st.session_state.get("profile_page") != page:
+        return 0
+    return st.session_state.get("profile_remaining", 0)
+
+
+@contextmanager
+def profiled(page):
+    """Profile the block if this session armed the profiler for page; saves one profile per run."""
+    if not remaining(page):
+        yield
+        return
+    if not _profiling.acquire(blocking=False):
+        st.sidebar.caption("🔬 Another render is being profiled; this one is not")
+        yield
+        return
+    try:
+        st.session_state.profile_remaining -= 1
+        st.sidebar.caption(f"🔬 Profiling this render ({remaining()} more after it)")
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            # st.rerun() and st.stop() end a render by raising; the work up to there is still worth keeping.
+            profile.disable()
+            try:
+                st.session_state.profile_last = save(profile, page)
+            except OSError:
+                log.exception("Could not save the profile of %r", page)
+    finally:
+        _profiling.release()
+
+
+def _slug(page):
+    return re.sub(r"[^a-z0-9]+", "-", page.lower()).strip("-")
+
+
+def save(profile, page):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{_slug(page)}.prof"
+    profile.dump_stats(os.path.join(PROFILE_DIR, name))
+    for old in list_profiles()[KEEP:]:
+        os.remove(os.path.join(PROFILE_DIR, old))
+    return name
+
+
+def list_profiles():
+    """Saved profile file names, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return sorted((name for name in os.listdir(PROFILE_DIR) if name.endswith(".prof")), reverse=True)
+
+
+def describe(name):
+    """A readable label such as "Question Papers, 2026-10-18 14:22:33" for a profile file name."""
+    saved = datetime.strptime(name[:15], "%Y%m%d-%H%M%S")
+    page = name[len("20261018-142233-123456-"):-len(".prof")]
+    return f"{page.replace('-', ' ').title()}, {saved:%Y-%m-%d %H:%M:%S}"
+
+
+def profile_path(name):
+    return os.path.join(PROFILE_DIR, os.path.basename(name))
+
+
+def _label(func):
+    filename, line, function = func
+    if filename == "~":
+        return function  # builtins: "<built-in method time.sleep>"
+    return f"{function} ({os.path.basename(filename)}:{line})"
+
+
+# Profiles never change once saved, so their reports are cached by file name.
+@st.cache_data(show_spinner=False, max_entries=16)
+def hotspots(name, limit=25):
+    """The top functions of a profile by cumulative time."""
+    stats = pstats.Stats(profile_path(name)).stats
+    rows = []
+    for func, (primitive_calls, calls, own, cumulative, _) in stats.items():
+        rows.append({
+            "Function": _label(func),
+            "Calls": str(calls) if calls == primitive_calls else f"{calls}/{primitive_calls}",
+            "Own ms": round(own * 1000, 2),
+            "Cumulative ms": round(cumulative * 1000, 2),
+        })
+    rows.sort(key=lambda row: -row["Cumulative ms"])
+    return rows[:limit]
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def total_seconds(name):
+    return pstats.Stats(profile_path(name)).total_tt
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def collapsed_stacks(name):
+    """The profile as "root;caller;callee microseconds" lines for flamegraph.pl or speedscope.
+
+    cProfile keeps caller/callee edges rather than whole stacks, so each
+    function's time is split across its callers in proportion to the time
+    spent on each edge. Recursive calls are cut at the first repeat.
+    """
+    stats = pstats.Stats(profile_path(name)).stats
+    children = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            children.setdefault(caller, []).append((func, cumulative))
+
+    lines = {}
+
+    def visit(func, stack, on_stack, share):
+        # share: the fraction of func's cumulative time that was spent under this stack.
+        stack = stack + (_label(func).replace(";", ","),)
+        key = ";".join(stack)
+        lines[key] = lines.get(key, 0) + stats[func][2] * share
+        for child, edge in children.get(func, ()):
+            child_total = stats[child][3]
+            # Paths under a microsecond are pruned, which also keeps deep call graphs tractable.
+            if child in on_stack or not child_total or share * edge * 1e6 < MIN_STACK_MICROSECONDS:
+                continue
+            visit(child, stack, on_stack | {child}, min(share * edge / child_total, 1.0))
+
+    for root, entry in stats.items():
+        if not entry[4]:
+            visit(root, (), {root}, 1.0)
+    return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in sorted(lines.items())
+                   if round(seconds * 1e6) >= MIN_STACK_MICROSECONDS)
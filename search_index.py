@@ -0,0 +1,255 @@
+"""Full-text search over question papers, notes and assignments.
+
+Text is extracted with PyMuPDF at upload time into each table's content_text
+column. Postgres keeps a weighted tsvector of filename/subject and content
+in a generated search_vector column with a GIN index (migrations/007). The
+search_documents RPC ranks hits across all three tables on the server and
+filters them by branch, regulation, year and semester. Rows uploaded before
+extraction existed can be indexed with:
+
+    python search_index.py backfill [--table pdfs]
+
+TrigramIndex is a compact in-memory fuzzy matcher over filenames and
+subjects for misspelt or differently spaced queries ("databse", "data base"),
+subject initials ("daa" for Design and Analysis of Algorithms) and the
+standard abbreviations in SUBJECT_ALIASES ("dbms"). It is built from
+catalog metadata only, so lookups never hit the database.
+"""
+import argparse
+import re
+from collections import defaultdict
+
+from blob_store import DOCUMENT_TABLES, load_row_bytes
+
+MAX_TEXT_CHARS = 200_000
+MAX_RESULTS = 50
+FUZZY_MIN_SCORE = 0.45
+# Below PostgREST's usual max-rows (1000), so a short page reliably means the end.
+NAMES_PAGE_SIZE = 500
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+CONNECTOR_WORDS = {"and", "of", "the", "in", "for", "to", "with", "on", "through"}
+# Regulation, year-semester and paper type around the subject in catalog filenames
+# ("R20 2-1 Design and Analysis of Algorithms Regular.pdf"); never part of a subject's initials.
+_CATALOG_TOKEN_RE = re.compile(r"r\d+|\d+(st|nd|rd|th)?|i{1,3}|iv|sem|semester|year|regular|supplementary|supply")
+# Standard abbreviations that are not the plain initials ("dbms") or count a connector word ("iot").
+SUBJECT_ALIASES = {
+    "dbms": "database management systems",
+    "os": "operating systems",
+    "cn": "computer networks",
+    "ds": "data structures",
+    "daa": "design and analysis of algorithms",
+    "oops": "object oriented programming",
+    "coa": "computer organization and architecture",
+    "toc": "theory of computation",
+    "flat": "formal languages and automata theory",
+    "iot": "internet of things",
+    "se": "software engineering",
+    "cd": "compiler design",
+    "wt": "web technologies",
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "cns": "cryptography and network security",
+    "dld": "digital logic design",
+    "beee": "basic electrical and electronics engineering",
+}
+
+
+def extract_text(pdf_bytes, max_chars=MAX_TEXT_CHARS):
+    """Return the plain text of a PDF (truncated to max_chars), or "" if it has none or cannot be parsed."""
+    # Only uploads and backfills extract text; the search pages must not pull in PyMuPDF.
+    import fitz  # PyMuPDF
+    from preview import fitz_lock
+
+    parts = []
+    length = 0
+    try:
+        with fitz_lock, fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+            for page in pdf:
+                text = page.get_text("text")
+                parts.append(text)
+                length += len(text)
+                if length >= max_chars:
+                    break
+    except Exception:
+        return ""
+    # Postgres text cannot hold NUL bytes, which some PDF text layers contain.
+    return "\n".join(parts)[:max_chars].replace("\x00", "")
+
+
+def search_documents(client, query, table=None, branch=None, regulation=None, year=None, semester=None,
+                     max_results=MAX_RESULTS):
+    """Return ranked hits as dicts with doc_table, id, filename, rank and snippet."""
+    if not query.strip():
+        return []
+    result = client.rpc("search_documents", {
+        "p_query": query,
+        "p_table": table,
+        "p_branch": branch,
+        "p_regulation": regulation,
+        "p_year": year,
+        "p_semester": semester,
+        "p_limit": max_results,
+    }).execute()
+    return result.data or []
+
+
+def _words(text):
+    return _WORD_RE.findall((text or "").lower().replace(".pdf", " "))
+
+
+def _variants(words):
+    """Words plus their run-together form, so "data base" finds "Database Management System"."""
+    variants = set(words)
+    if len(words) > 1:
+        variants.add("".join(words))
+    return variants
+
+
+def _significant(words):
+    """The subject's own words: no catalog tokens (regulation, year, semester, paper type), no connector words."""
+    return [word for word in words if word not in CONNECTOR_WORDS and not _CATALOG_TOKEN_RE.fullmatch(word)]
+
+
+def _singular(word):
+    return word[:-1] if len(word) > 3 and word.endswith("s") else word
+
+
+_ALIAS_PHRASES = {alias: [_singular(word) for word in _significant(_words(name))]
+                  for alias, name in SUBJECT_ALIASES.items()}
+
+
+def acronyms(words):
+    """Initials of a multi-word name plus the standard abbreviations it spells out.
+
+    "R20 2-1 Design and Analysis of Algorithms Regular.pdf" gives {"daa"},
+    "Database Management Systems" gives {"dms", "dbms"}.
+    """
+    significant = _significant(words)
+    found = {"".join(word[0] for word in significant)} if len(significant) > 1 else set()
+    singular = [_singular(word) for word in significant]
+    for alias, phrase in _ALIAS_PHRASES.items():
+        if any(singular[i:i + len(phrase)] == phrase for i in range(len(singular) - len(phrase) + 1)):
+            found.add(alias)
+    return found
+
+
+def trigrams(words):
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Inverted trigram index over (table, id, filename, subject) catalog entries."""
+
+    def __init__(self, entries):
+        self.entries = []
+        self._postings = defaultdict(list)
+        # Initials are matched exactly: as trigrams, "daa" against a long subject scores under the threshold.
+        self._acronyms = defaultdict(list)
+        for entry in entries:
+            subject_words, filename_words = _words(entry.get("subject")), _words(entry.get("filename"))
+            grams = trigrams(_variants(subject_words) | _variants(filename_words))
+            if not grams:
+                continue
+            position = len(self.entries)
+            self.entries.append((entry["table"], str(entry["id"]), entry.get("filename"), entry.get("subject"),
+                                 len(grams)))
+            for gram in grams:
+                self._postings[gram].append(position)
+            for acronym in acronyms(subject_words) | acronyms(filename_words):
+                self._acronyms[acronym].append(position)
+
+    def search(self, query, table=None, limit=MAX_RESULTS, min_score=FUZZY_MIN_SCORE, ids=None):
+        """Return [(score, table, id, filename, subject)] best first.
+
+        The score mixes how much of the query is found in the entry with a
+        Jaccard term, so short queries still match long filenames. ids
+        restricts the candidates (e.g. to rows already filtered by the page)
+        before the limit is applied; limit=None returns every hit.
+        """
+        words = _words(query)
+        query_grams = trigrams(_variants(words))
+        if not query_grams:
+            return []
+        overlap = defaultdict(int)
+        for gram in query_grams:
+            for position in self._postings.get(gram, ()):
+                overlap[position] += 1
+        # "daa", but also "r20 daa": filters typed into the query are not part of the abbreviation.
+        significant = _significant(words)
+        exact = set(self._acronyms.get(significant[0], ())) if len(significant) == 1 else set()
+        hits = []
+        for position in overlap.keys() | exact:
+            entry_table, entry_id, filename, subject, size = self.entries[position]
+            if table and entry_table != table or ids is not None and entry_id not in ids:
+                continue
+            if position in exact:
+                score = 1.0
+            else:
+                shared = overlap[position]
+                containment = shared / len(query_grams)
+                jaccard = shared / (len(query_grams) + size - shared)
+                score = 0.8 * containment + 0.2 * jaccard
+            if score >= min_score:
+                hits.append((score, entry_table, entry_id, filename, subject))
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        return hits if limit is None else hits[:limit]
+
+
+def fetch_catalog_names(client, page_size=NAMES_PAGE_SIZE):
+    """Catalog metadata the fuzzy index is built from; no content or blobs.
+
+    Each table is read in id-keyset pages, since one unpaged select is cut off at the server's max-rows.
+    """
+    entries = []
+    for table, columns in (("pdfs", "id, filename"), ("subject_notes", "id, filename, subject"),
+                           ("assignments", "id, filename, subject")):
+        after_id = None
+        while True:
+            query = client.table(table).select(columns)
+            if after_id is not None:
+                query = query.gt("id", after_id)
+            rows = query.order("id").limit(page_size).execute().data or []
+            entries.extend({"table": table, **row} for row in rows)
+            if len(rows) < page_size:
+                break
+            after_id = rows[-1]["id"]
+    return entries
+
+
+def backfill_table(client, table, batch_size=20):
+    """Extract content_text for rows that were uploaded before text extraction existed."""
+    done = 0
+    while True:
+        rows = client.table(table).select("id, blob_hash, filedata").is_("content_text", "null") \
+            .limit(batch_size).execute().data or []
+        if not rows:
+            return done
+        for row in rows:
+            data = load_row_bytes(row)
+            client.table(table).update({"content_text": extract_text(data) if data else ""}) \
+                .eq("id", row["id"]).execute()
+            done += 1
+        print(f"{table}: {done} row(s) indexed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exam Buddy search index tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    backfill = sub.add_parser("backfill", help="Extract text for rows uploaded before indexing existed.")
+    backfill.add_argument("--table", choices=DOCUMENT_TABLES, action="append")
+    backfill.add_argument("--batch", type=int, default=20)
+    args = parser.parse_args()
+
+    from db import get_supabase
+    client = get_supabase()
+    for table in args.table or DOCUMENT_TABLES:
+        print(f"{table}: done, {backfill_table(client, table, args.batch)} row(s) indexed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Startup timing report and budget check for main.py.
+
+Two measurements:
+
+* import time per module, for exactly the imports at the top of main.py, in a
+  fresh interpreter with -X importtime, over and above importing streamlit;
+* time to first render, running the app once headless with Streamlit's
+  AppTest (this needs the usual .streamlit/secrets.toml).
+
+The check fails (exit code 1) when either goes over its budget, or when one
+of HEAVY_MODULES is imported eagerly instead of inside the page that needs it:
+
+    python startup_check.py [--import-budget 1.5] [--render-budget 3.0] [--skip-render]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(BASE_DIR, "main.py")
+IMPORT_BUDGET = 1.5
+RENDER_BUDGET = 3.0
+HEAVY_MODULES = ("pandas", "plotly", "fitz", "PIL", "reportlab")
+BASELINE_IMPORT = "import streamlit"
+
+
+def top_level_imports(path=APP):
+    """Source of the import statements at module level of the app, in order."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def _importtime(code):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BASE_DIR,
+                            capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"Importing the app's modules failed:\n{result.stderr[-2000:]}")
+    timings, loaded = {}, set()
+    for line in result.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        loaded.add(name.strip())
+        if not name[1:].startswith(" "):
+            # Nested imports are indented; the top level ones are what main.py pays for.
+            timings[name.strip()] = int(cumulative) / 1e6
+    return timings, loaded
+
+
+def measure_imports(statements):
+    """Return {top-level module: cumulative seconds}, the set of modules the app's imports add, and streamlit's own seconds.
+
+    Streamlit is the baseline: every page pays for it before main.py runs, and
+    it pulls in some of HEAVY_MODULES (plotly, pandas) by itself. Streamlit is
+    imported first in the measured run too, so the timings and the loaded set
+    only cover what the app adds on top of it.
+    """
+    baseline_timings, baseline = _importtime(BASELINE_IMPORT)
+    timings, loaded = _importtime("\n".join([BASELINE_IMPORT, *statements]))
+    timings = {name: seconds for name, seconds in timings.items() if name not in baseline}
+    return timings, loaded - baseline, sum(baseline_timings.values())
+
+
+def measure_first_render(timeout):
+    from streamlit.testing.v1 import AppTest
+
+    started = time.perf_counter()
+    app = AppTest.from_file(APP, default_timeout=timeout).run()
+    return time.perf_counter() - started, [str(error.value) for error in app.exception]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report main.py startup time and check it against a budget.")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET, help="seconds")
+    parser.add_argument("--render-budget", type=float, default=RENDER_BUDGET, help="seconds")
+    parser.add_argument("--top", type=int, default=15, help="modules to list")
+    parser.add_argument("--skip-render", action="store_true", help="only measure imports")
+    args = parser.parse_args()
+
+    failures = []
+    timings, loaded, baseline_seconds = measure_imports(top_level_imports())
+    total = sum(timings.values())
+    print(f"Imports: {total:.3f}s on top of streamlit's {baseline_seconds:.3f}s (budget {args.import_budget:.3f}s)")
+    for name, seconds in sorted(timings.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {seconds:8.3f}s  {name}")
+    if total > args.import_budget:
+        failures.append(f"imports took {total:.3f}s")
+    eager = sorted(name for name in HEAVY_MODULES if name in loaded)
+    if eager:
+        failures.append(f"heavy modules imported at startup: {', '.join(eager)}")
+
+    if not args.skip_render:
+        seconds, errors = measure_first_render(timeout=max(args.render_budget * 4, 10))
+        print(f"First render: {seconds:.3f}s (budget {args.render_budget:.3f}s)")
+        for error in errors:
+            print(f"  exception: {error}")
+        if seconds > args.render_budget:
+            failures.append(f"first render took {seconds:.3f}s")
+        if errors:
+            failures.append("first render raised")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
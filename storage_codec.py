@@ -0,0 +1,116 @@
+"""Self-describing compression for stored documents.
+
+Every encoded payload starts with a 5 byte header: the magic b"EBC1" and one
+codec id byte. The codec is chosen per file by compressing a sample with each
+available codec and keeping the one with the best measured ratio; files that
+do not shrink by at least MIN_SAVING are stored as-is (identity).
+
+Payloads written before this header existed are sniffed: raw PDFs are served
+unchanged and bare zlib streams (the old ">5 MB" upload path) are inflated.
+"""
+import io
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+MAGIC = b"EBC1"
+HEADER_SIZE = len(MAGIC) + 1
+CHUNK_SIZE = 64 * 1024
+SAMPLE_SIZE = 1024 * 1024
+MIN_SAVING = 0.10
+
+IDENTITY, ZLIB, ZSTD = 0, 1, 2
+CODEC_NAMES = {IDENTITY: "identity", ZLIB: "zlib", ZSTD: "zstd"}
+
+
+def available_codecs():
+    codecs = [ZLIB]
+    if zstandard is not None:
+        codecs.insert(0, ZSTD)
+    return codecs
+
+
+def _compress(codec, data):
+    if codec == ZLIB:
+        return zlib.compress(data, 6)
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    return data
+
+
+def choose_codec(data):
+    """Pick the codec with the best ratio on a sample of data, or IDENTITY if none saves enough."""
+    sample = data[:SAMPLE_SIZE]
+    if not sample:
+        return IDENTITY
+    best_codec, best_size = IDENTITY, len(sample)
+    for codec in available_codecs():
+        size = len(_compress(codec, sample))
+        if size < best_size:
+            best_codec, best_size = codec, size
+    if best_size > len(sample) * (1 - MIN_SAVING):
+        return IDENTITY
+    return best_codec
+
+
+def encode(data, codec=None):
+    """Return data framed with the codec header, compressing with codec or the best measured one."""
+    if codec is None:
+        codec = choose_codec(data)
+    return MAGIC + bytes([codec]) + _compress(codec, data)
+
+
+def _looks_like_zlib(head):
+    return len(head) >= 2 and head[0] & 0x0F == 8 and (head[0] << 8 | head[1]) % 31 == 0
+
+
+def sniff(head):
+    """Return (codec, header_length) for the first bytes of a stored payload."""
+    if head[:len(MAGIC)] == MAGIC and len(head) >= HEADER_SIZE:
+        codec = head[len(MAGIC)]
+        if codec not in CODEC_NAMES:
+            raise ValueError(f"Unknown storage codec id: {codec}")
+        return codec, HEADER_SIZE
+    if _looks_like_zlib(head):
+        return ZLIB, 0
+    return IDENTITY, 0
+
+
+def _decompressor(codec):
+    if codec == ZLIB:
+        return zlib.decompressobj()
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("This file is zstd-compressed; install the 'zstandard' package to read it.")
+        return zstandard.ZstdDecompressor().decompressobj()
+    return None
+
+
+def iter_decoded(fileobj, chunk_size=CHUNK_SIZE):
+    """Yield decoded chunks from a file-like object holding a stored payload."""
+    head = fileobj.read(HEADER_SIZE)
+    codec, header_length = sniff(head)
+    pending = head[header_length:] or fileobj.read(chunk_size)
+    decompressor = _decompressor(codec)
+    while pending:
+        chunk = decompressor.decompress(pending) if decompressor else pending
+        if chunk:
+            yield chunk
+        pending = fileobj.read(chunk_size)
+    if codec == ZLIB:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def decode(payload):
+    codec, header_length = sniff(payload[:HEADER_SIZE])
+    body = payload[header_length:]
+    if codec == ZLIB:
+        return zlib.decompress(body)
+    if codec == ZSTD:
+        return b"".join(iter_decoded(io.BytesIO(payload)))
+    return body
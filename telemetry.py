@@ -0,0 +1,182 @@
+"""Buffered usage events: previews, downloads and searches.
+
+record() only appends to an in-process buffer, so a page render never waits
+on a telemetry write. A daemon thread flushes the buffer to the events table
+(migrations/011_events.sql) in batched inserts every flush_interval seconds,
+or sooner once flush_batch events are waiting. If the insert fails, the
+batch is spooled to a JSON-lines file and replayed before the next
+successful flush, so a backend hiccup loses nothing. Settings live under
+[telemetry] in secrets.toml:
+
+    [telemetry]
+    flush_interval = 5       # seconds between flushes
+    flush_batch = 200        # events per insert
+    buffer_size = 10000      # oldest events are dropped beyond this
+    spool_dir = "telemetry_spool"
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+import streamlit as st
+
+import metrics
+from db import get_supabase
+
+EVENT_TYPES = ("preview", "download", "search")
+
+_settings = st.secrets.get("telemetry", {})
+FLUSH_INTERVAL = float(_settings.get("flush_interval", 5))
+FLUSH_BATCH = int(_settings.get("flush_batch", 200))
+BUFFER_SIZE = int(_settings.get("buffer_size", 10000))
+SPOOL_DIR = _settings.get("spool_dir", "telemetry_spool")
+
+log = logging.getLogger(__name__)
+
+
+class EventSpool:
+    """Batches that could not be inserted, one JSON-lines file per batch."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def write(self, events):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.jsonl")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+        os.replace(path + ".tmp", path)
+        metrics.inc("telemetry_events_spooled_total", len(events))
+
+    def pending(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(os.path.join(self.root, name) for name in os.listdir(self.root) if name.endswith(".jsonl"))
+
+    @staticmethod
+    def read(path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class EventBuffer:
+    """Thread-safe event buffer with a background flush worker."""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, flush_batch=FLUSH_BATCH, buffer_size=BUFFER_SIZE,
+                 spool_dir=SPOOL_DIR, client_factory=get_supabase):
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.spool = EventSpool(spool_dir)
+        self.client_factory = client_factory
+        self.dropped = 0
+        self._events = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="telemetry-flush", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def record(self, event_type, table=None, doc_id=None, session_id=None, query=None, results=None):
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+        event = {
+            "event_type": event_type,
+            "table_name": table,
+            "doc_id": None if doc_id is None else str(doc_id),
+            "session_id": session_id,
+            "query": query,
+            "results": results,
+            "occurred_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            if len(self._events) >= self.flush_batch:
+                self._wake.set()
+
+    def _take(self):
+        with self._lock:
+            count = min(len(self._events), self.flush_batch)
+            return [self._events.popleft() for _ in range(count)]
+
+    def flush(self):
+        """Replay spooled batches, then insert everything buffered; returns the number of events written."""
+        with self._flush_lock:
+            written = 0
+            try:
+                client = self.client_factory()
+            except Exception as e:
+                log.warning("Spooling telemetry, no database client: %s", e)
+                self._spool_buffered()
+                return written
+            for path in self.spool.pending():
+                events = self.spool.read(path)
+                try:
+                    client.table("events").insert(events).execute()
+                except Exception:
+                    # Still unreachable: keep the spool in order and add the buffer to it.
+                    self._spool_buffered()
+                    return written
+                os.remove(path)
+                written += len(events)
+            while True:
+                batch = self._take()
+                if not batch:
+                    return written
+                try:
+                    client.table("events").insert(batch).execute()
+                except Exception as e:
+                    log.warning("Spooling %d telemetry event(s): %s", len(batch), e)
+                    self.spool.write(batch)
+                    return written
+                written += len(batch)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("Telemetry flush failed")
+
+    def close(self):
+        """Stop the worker and write out what is left, spooling it if the backend is down."""
+        self._stop.set()
+        self._wake.set()
+        try:
+            self.flush()
+        except Exception:
+            self._spool_buffered()
+
+    def _spool_buffered(self):
+        batch = self._take()
+        while batch:
+            self.spool.write(batch)
+            batch = self._take()
+
+
+@st.cache_resource(show_spinner=False)
+def get_telemetry():
+    """The process-wide event buffer, started on first use."""
+    return EventBuffer().start()
+
+
+def record(event_type, table=None, doc_id=None, session_id=None, query=None, results=None):
+    """Queue one event; never raises into the caller's request path."""
+    try:
+        get_telemetry().record(event_type, table, doc_id, session_id, query, results)
+    except Exception:
+        log.exception("Dropping telemetry event")
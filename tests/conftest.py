@@ -0,0 +1,195 @@
+"""Shared fixtures: a throwaway working directory with secrets, and an in-memory Supabase stand-in.
+
+The app modules read .streamlit/secrets.toml from the working directory when
+they are imported, so the directory is set up before any test module loads.
+"""
+import itertools
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="exam-buddy-tests-")
+
+os.makedirs(os.path.join(WORKDIR, ".streamlit"))
+with open(os.path.join(WORKDIR, ".streamlit", "secrets.toml"), "w") as f:
+    f.write("""
+[supabase]
+url = "http://127.0.0.1:9"
+key = "test"
+
+[admin]
+username = "admin"
+password = "admin"
+
+[storage]
+backend = "local"
+root = "media"
+
+[metrics]
+textfile = ""
+""")
+os.chdir(WORKDIR)
+sys.path.insert(0, REPO)
+
+# Document columns that reference blobs(hash), as in migrations 005 and 013.
+BLOB_REFERENCES = [(table, column) for table in ("pdfs", "subject_notes", "assignments")
+                   for column in ("blob_hash", "thumb_hash")]
+
+
+def _fk_violation(message):
+    return APIError({"code": "23503", "message": message, "details": None, "hint": None})
+
+
+class FakeQuery:
+    """Just enough of the postgrest-py builder for the code under test."""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.operation = "select"
+        self.payload = None
+        self.filters = []
+        self.row_limit = None
+        self.descending = None
+        self.order_column = None
+        self.ignore_duplicates = False
+
+    def select(self, columns="*", count=None):
+        self.operation = "select"
+        return self
+
+    def insert(self, rows, **_):
+        self.operation, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False, **_):
+        self.operation, self.payload, self.ignore_duplicates = "upsert", rows, ignore_duplicates
+        return self
+
+    def update(self, values):
+        self.operation, self.payload = "update", values
+        return self
+
+    def delete(self, **_):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: str(row.get(column)) == str(value))
+        return self
+
+    def in_(self, column, values):
+        values = {str(value) for value in values}
+        self.filters.append(lambda row: str(row.get(column)) in values)
+        return self
+
+    def is_(self, column, value):
+        self.filters.append(lambda row: row.get(column) is None)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) > value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) < value)
+        return self
+
+    def order(self, column, desc=False):
+        self.order_column, self.descending = column, desc
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def _matching(self):
+        return [row for row in self.db.tables.setdefault(self.table, [])
+                if all(check(row) for check in self.filters)]
+
+    def execute(self):
+        self.db.calls.append((self.table, self.operation))
+        if self.db.before_execute:
+            self.db.before_execute(self.table, self.operation)
+        handler = getattr(self, f"_{self.operation}")
+        return SimpleNamespace(data=handler(), count=None)
+
+    def _select(self):
+        rows = self._matching()
+        if self.order_column:
+            rows = sorted(rows, key=lambda row: row[self.order_column], reverse=self.descending)
+        return [dict(row) for row in rows[:self.row_limit]]
+
+    def _insert(self):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        for row in rows:
+            self.db.check_references(self.table, row)
+        inserted = []
+        for row in rows:
+            row = {"id": next(self.db.ids), **row}
+            self.db.tables.setdefault(self.table, []).append(row)
+            inserted.append(dict(row))
+        return inserted
+
+    def _upsert(self):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        table = self.db.tables.setdefault(self.table, [])
+        existing = {row["hash"] for row in table}
+        added = [dict(row) for row in rows if row["hash"] not in existing]
+        table.extend(added)
+        return [dict(row) for row in added]
+
+    def _update(self):
+        rows = self._matching()
+        for row in rows:
+            row.update(self.payload)
+        return [dict(row) for row in rows]
+
+    def _delete(self):
+        rows = self._matching()
+        if self.table == "blobs":
+            for row in rows:
+                self.db.check_unreferenced(row["hash"])
+        self.db.tables[self.table] = [row for row in self.db.tables[self.table] if row not in rows]
+        return [dict(row) for row in rows]
+
+
+class FakeSupabase:
+    """In-memory tables with the blob foreign keys enforced like Postgres would."""
+
+    def __init__(self):
+        self.tables = {"blobs": []}
+        self.ids = itertools.count(1)
+        self.calls = []
+        # before_execute(table, operation) runs ahead of every request, to interleave other work.
+        self.before_execute = None
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def check_references(self, table, row):
+        blobs = {blob["hash"] for blob in self.tables["blobs"]}
+        for column in ("blob_hash", "thumb_hash"):
+            if (table, column) in BLOB_REFERENCES and row.get(column) and row[column] not in blobs:
+                raise _fk_violation(f"{table}.{column} {row[column]} is not in blobs")
+
+    def check_unreferenced(self, blob_hash):
+        for table, column in BLOB_REFERENCES:
+            if any(row.get(column) == blob_hash for row in self.tables.get(table, [])):
+                raise _fk_violation(f"blobs {blob_hash} is still referenced from {table}.{column}")
+
+
+@pytest.fixture
+def supabase():
+    return FakeSupabase()
+
+
+@pytest.fixture
+def blob_store(tmp_path):
+    from blob_store import LocalBlobStore
+    return LocalBlobStore(str(tmp_path / "media"))
@@ -0,0 +1,34 @@
+import httpx
+import pytest
+
+from db import request_labels
+
+BASE = "https://project.supabase.co"
+
+
+@pytest.mark.parametrize("method, path, labels", [
+    ("GET", "/rest/v1/pdfs", ("pdfs", "select")),
+    ("POST", "/rest/v1/rpc/search_documents", ("search_documents", "rpc")),
+    ("POST", "/storage/v1/object/documents/ab/abcd", ("storage:documents", "upload")),
+    ("PUT", "/storage/v1/object/documents/ab/abcd", ("storage:documents", "upload")),
+    ("GET", "/storage/v1/object/authenticated/documents/ab/abcd", ("storage:documents", "download")),
+    ("GET", "/storage/v1/object/public/documents/ab/abcd", ("storage:documents", "download")),
+    ("HEAD", "/storage/v1/object/documents/ab/abcd", ("storage:documents", "info")),
+    ("GET", "/storage/v1/object/info/documents/ab/abcd", ("storage:documents", "info")),
+    ("POST", "/storage/v1/object/list/documents", ("storage:documents", "list")),
+    ("POST", "/storage/v1/object/list-v2/documents", ("storage:documents", "list")),
+    ("DELETE", "/storage/v1/object/documents", ("storage:documents", "remove")),
+    ("POST", "/storage/v1/object/sign/documents/ab/abcd", ("storage:documents", "sign")),
+    ("GET", "/storage/v1/object/sign/documents/ab/abcd", ("storage:documents", "download")),
+    ("POST", "/storage/v1/object/upload/sign/documents/ab/abcd", ("storage:documents", "sign")),
+    ("PUT", "/storage/v1/object/upload/sign/documents/ab/abcd", ("storage:documents", "upload")),
+    ("POST", "/storage/v1/object/move", ("storage:", "move")),
+])
+def test_request_labels(method, path, labels):
+    assert request_labels(httpx.Request(method, BASE + path)) == labels
+
+
+def test_upsert_is_labelled_from_the_prefer_header():
+    request = httpx.Request("POST", BASE + "/rest/v1/blobs", headers={"Prefer": "resolution=ignore-duplicates"})
+
+    assert request_labels(request) == ("blobs", "upsert")
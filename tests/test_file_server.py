@@ -0,0 +1,99 @@
+import http.client
+import threading
+from http.server import ThreadingHTTPServer
+
+import fitz
+import pytest
+
+import file_server
+import ingest
+import preview
+
+
+@pytest.fixture
+def server(monkeypatch, supabase, blob_store):
+    monkeypatch.setattr(file_server, "get_supabase", lambda: supabase)
+    monkeypatch.setattr(file_server, "get_blob_store", lambda: blob_store)
+    monkeypatch.setattr(file_server, "file_cache", file_server.ByteBudgetCache(
+        file_server.CACHE_BUDGET_BYTES, sizeof=lambda entry: len(entry["data"])))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), file_server.FileRequestHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(server, method, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def add_document(supabase, blob_store, data):
+    blob_hash = blob_store.put(data)
+    supabase.tables["blobs"].append({"hash": blob_hash, "size": len(data)})
+    supabase.tables.setdefault("pdfs", []).append({
+        "id": 1, "filename": "notes.pdf", "blob_hash": blob_hash, "filedata": None,
+        "size": len(data), "uploaded_at": "2026-10-01T10:00:00+00:00",
+    })
+    return blob_hash
+
+
+def test_streams_a_stored_document(server, supabase, blob_store):
+    data = b"%PDF-1.7 " + bytes(range(256)) * 100
+    add_document(supabase, blob_store, data)
+
+    status, headers, body = request(server, "GET", "/files/pdfs/1")
+
+    assert status == 200
+    assert int(headers["Content-Length"]) == len(data)
+    assert body == data
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD"])
+def test_missing_blob_is_not_found(server, supabase, method):
+    supabase.tables["pdfs"] = [{
+        "id": 1, "filename": "gone.pdf", "blob_hash": "ab" * 32, "filedata": None,
+        "size": 100, "uploaded_at": "2026-10-01T10:00:00+00:00",
+    }]
+
+    status, _, _ = request(server, method, "/files/pdfs/1")
+
+    assert status == 404
+
+
+def test_storage_error_is_bad_gateway(server, supabase, blob_store, monkeypatch):
+    add_document(supabase, blob_store, b"%PDF-1.7 body")
+
+    def unreachable(blob_hash):
+        raise ConnectionError("storage is down")
+
+    monkeypatch.setattr(blob_store, "open_raw", unreachable)
+
+    status, _, _ = request(server, "GET", "/files/pdfs/1")
+
+    assert status == 502
+
+
+def test_deleted_document_is_not_served_from_the_cache(server, supabase, blob_store, monkeypatch):
+    monkeypatch.setattr(ingest, "get_blob_store", lambda: blob_store)
+    monkeypatch.setattr(preview, "get_blob_store", lambda: blob_store)
+    with fitz.open() as pdf:
+        pdf.new_page().insert_text((72, 72), "Unit 1")
+        data = pdf.tobytes()
+    ingest.ingest_documents(supabase, "pdfs", [("notes.pdf", data)], {"subject": "Operating Systems"})
+    [row] = supabase.tables["pdfs"]
+
+    status, _, body = request(server, "GET", f"/files/pdfs/{row['id']}")
+    assert (status, body) == (200, data)
+    assert file_server.file_cache.get(("pdfs", str(row["id"]))) is not None
+
+    ingest.delete_documents(supabase, "pdfs", [row["id"]])
+
+    status, _, _ = request(server, "GET", f"/files/pdfs/{row['id']}")
+    assert status == 404
@@ -0,0 +1,109 @@
+"""Uploads racing with deletes of documents that share their content."""
+import fitz
+import pytest
+
+import ingest
+import preview
+
+FILTERS = {"subject": "Design and Analysis of Algorithms", "regulation": "R20"}
+
+
+def make_pdf(text):
+    with fitz.open() as pdf:
+        pdf.new_page().insert_text((72, 72), text)
+        return pdf.tobytes()
+
+
+@pytest.fixture
+def store(monkeypatch, blob_store):
+    monkeypatch.setattr(ingest, "get_blob_store", lambda: blob_store)
+    monkeypatch.setattr(preview, "get_blob_store", lambda: blob_store)
+    return blob_store
+
+
+def upload(supabase, data, name="paper.pdf", filters=FILTERS):
+    [result] = ingest.ingest_documents(supabase, "pdfs", [(name, data)], filters)
+    return result
+
+
+def document_blobs(supabase, name):
+    [row] = [row for row in supabase.tables["pdfs"] if row["filename"] == name]
+    return row["blob_hash"], row["thumb_hash"]
+
+
+def assert_stored(supabase, store, name):
+    for blob_hash in document_blobs(supabase, name):
+        assert any(blob["hash"] == blob_hash for blob in supabase.tables["blobs"])
+        assert store.exists(blob_hash)
+
+
+def test_delete_releases_unreferenced_blobs(supabase, store):
+    upload(supabase, make_pdf("Unit 1"))
+    hashes = document_blobs(supabase, "paper.pdf")
+
+    rows, released = ingest.delete_documents(supabase, "pdfs", [1])
+
+    assert [row["id"] for row in rows] == [1]
+    assert sorted(released) == sorted(hashes)
+    assert supabase.tables["blobs"] == []
+    assert not any(store.exists(blob_hash) for blob_hash in hashes)
+
+
+def test_release_after_the_upload_found_the_files_stored(supabase, store, monkeypatch):
+    data = make_pdf("Unit 1")
+    upload(supabase, data, "old.pdf")
+    real_catalog_metadata = ingest.catalog_metadata
+
+    def catalog_metadata_then_delete(pdf_bytes):
+        # Both puts of the new upload were skipped because the old document's files were there.
+        metadata = real_catalog_metadata(pdf_bytes)
+        ingest.delete_documents(supabase, "pdfs", [1])
+        return metadata
+
+    monkeypatch.setattr(ingest, "catalog_metadata", catalog_metadata_then_delete)
+
+    result = upload(supabase, data, "new.pdf")
+
+    assert result["status"] == "uploaded"
+    assert_stored(supabase, store, "new.pdf")
+
+
+def test_release_after_the_upload_registered_the_blobs(supabase, store):
+    data = make_pdf("Unit 1")
+    # The same paper under another regulation, so the new upload is not a duplicate of it.
+    upload(supabase, data, "old.pdf", {**FILTERS, "regulation": "R19"})
+    inserts = []
+
+    def delete_before_insert(table, operation):
+        if table == "pdfs" and operation == "insert" and not inserts:
+            inserts.append(table)
+            ingest.delete_documents(supabase, "pdfs", [1])
+
+    supabase.before_execute = delete_before_insert
+
+    result = upload(supabase, data, "new.pdf")
+
+    assert result["status"] == "uploaded"
+    assert inserts
+    assert_stored(supabase, store, "new.pdf")
+
+
+def test_upload_between_the_row_and_the_file_delete(supabase, store, monkeypatch):
+    data = make_pdf("Unit 1")
+    upload(supabase, data, "old.pdf")
+    real_delete = store.delete
+    results = []
+
+    def upload_then_delete(blob_hash):
+        if not results:
+            # The release has deleted the blobs rows; the same paper is uploaded again right now.
+            results.append(upload(supabase, data, "new.pdf"))
+        real_delete(blob_hash)
+
+    monkeypatch.setattr(store, "delete", upload_then_delete)
+
+    _, released = ingest.delete_documents(supabase, "pdfs", [1])
+
+    assert results[0]["status"] == "uploaded"
+    assert released == []
+    assert_stored(supabase, store, "new.pdf")
@@ -0,0 +1,28 @@
+from lottie_assets import optimize
+
+
+def animation(expression=None):
+    position = {"a": 0, "k": [10.12345, 20.0], "ix": 2}
+    if expression:
+        position["x"] = expression
+    return {
+        "v": "5.7.4", "ip": 0, "op": 60, "nm": "Hero", "assets": [],
+        "layers": [{"ind": 1, "ty": 4, "nm": "Book", "mn": "ADBE Vector Layer", "ip": 0, "op": 60,
+                    "np": 3, "ks": {"p": position}}],
+    }
+
+
+def test_names_and_indexes_are_stripped_without_expressions():
+    [layer] = optimize(animation())["layers"]
+
+    assert "nm" not in layer and "mn" not in layer and "np" not in layer
+    assert layer["ks"]["p"] == {"a": 0, "k": [10.123, 20]}
+
+
+def test_expressions_keep_what_they_look_up():
+    [layer] = optimize(animation('thisComp.layer("Book").transform.position'))["layers"]
+
+    assert layer["nm"] == "Book"
+    assert layer["mn"] == "ADBE Vector Layer"
+    assert layer["ks"]["p"]["ix"] == 2
+    assert "np" not in layer
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz
+import pytest
+
+import pdf_compress
+
+
+class BrokenPool:
+    """A pool whose worker died: every submit fails until it is replaced."""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Threads stand in for the spawned workers; only the pool's lifecycle is under test.
+    monkeypatch.setattr(pdf_compress, "ProcessPoolExecutor",
+                        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers))
+    monkeypatch.setattr(pdf_compress, "POOL_WORKERS", 2)
+    yield
+    if pdf_compress._pool is not None:
+        pdf_compress._pool.shutdown()
+    pdf_compress._pool = None
+
+
+def make_pdf(pages):
+    with fitz.open() as pdf:
+        for number in range(pages):
+            pdf.new_page().insert_text((72, 72), f"Question {number + 1}")
+        return pdf.tobytes()
+
+
+def test_broken_pool_is_replaced_and_the_upload_retried(pool):
+    broken = pdf_compress._pool = BrokenPool()
+
+    _, report = pdf_compress.compress_pdf(make_pdf(3), in_process_pages=1)
+
+    assert [page["page"] for page in report["pages"]] == [1, 2, 3]
+    assert broken.shut_down
+    assert pdf_compress._pool is not broken
+
+
+def test_pool_broken_twice_raises(pool, monkeypatch):
+    monkeypatch.setattr(pdf_compress, "ProcessPoolExecutor", lambda max_workers, mp_context: BrokenPool())
+
+    with pytest.raises(BrokenProcessPool):
+        pdf_compress.compress_pdf(make_pdf(3), in_process_pages=1)
+    assert pdf_compress._pool is None
@@ -0,0 +1,35 @@
+import pytest
+
+from search_index import TrigramIndex, _words, acronyms
+
+CATALOG = [
+    {"table": "pdfs", "id": 1, "filename": "R20 2-1 Design and Analysis of Algorithms Regular.pdf"},
+    {"table": "pdfs", "id": 2, "filename": "R20 2-1 Data Structures Supplementary.pdf"},
+    {"table": "subject_notes", "id": 3, "filename": "unit1.pdf", "subject": "Database Management Systems"},
+    {"table": "subject_notes", "id": 4, "filename": "notes.pdf", "subject": "Internet of Things"},
+    {"table": "subject_notes", "id": 5, "filename": "os_unit2.pdf", "subject": "Operating Systems"},
+]
+
+
+def test_acronyms_skip_catalog_tokens_and_connector_words():
+    assert acronyms(_words("R20 2-1 Design and Analysis of Algorithms Regular.pdf")) == {"daa"}
+    assert acronyms(_words("R23 III Sem Regular")) == set()
+
+
+def test_acronyms_include_standard_abbreviations():
+    assert acronyms(_words("Database Management Systems")) == {"dms", "dbms"}
+    assert "cn" in acronyms(_words("Computer Networks Lab"))
+
+
+@pytest.mark.parametrize("query, table, doc_id", [
+    ("daa", "pdfs", "1"),
+    ("DAA", "pdfs", "1"),
+    ("r20 daa", "pdfs", "1"),
+    ("dbms", "subject_notes", "3"),
+    ("iot", "subject_notes", "4"),
+    ("os", "subject_notes", "5"),
+])
+def test_abbreviation_finds_the_subject(query, table, doc_id):
+    hits = TrigramIndex(CATALOG).search(query)
+
+    assert hits[0][:3] == (1.0, table, doc_id)
@@ -0,0 +1,17 @@
+import startup_check
+
+
+def test_streamlit_itself_is_the_baseline():
+    timings, loaded, baseline_seconds = startup_check.measure_imports(["import streamlit as st"])
+
+    assert timings == {}
+    assert loaded == set()
+    assert baseline_seconds > 0
+
+
+def test_reports_modules_added_on_top_of_streamlit():
+    timings, loaded, _ = startup_check.measure_imports(["import streamlit as st", "import fitz"])
+
+    assert "fitz" in timings
+    assert "fitz" in loaded
+    assert "streamlit" not in timings
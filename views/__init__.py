@@ -0,0 +1,103 @@
+"""Page registry for the app.
+
+Each page lives in its own module with a render() function. A module is only
+imported the first time its page is opened (so, e.g., pandas and plotly load
+with the dashboard, not at startup) and stays cached for the process. Every
+render is timed, and per-page timings are kept for the admin dashboard.
+Renders an admin armed the profiler for run under cProfile (see profiler.py).
+
+Not named pages/, which Streamlit would turn into its own multipage navigation.
+"""
+import importlib
+import logging
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+import metrics
+import profiler
+
+PAGES = {
+    "Home": "views.home",
+    "Question Papers": "views.papers",
+    "Subject Notes": "views.notes",
+    "Assignments": "views.assignments",
+    "Aptitude Test": "views.aptitude",
+    "Weekly Quiz": "views.quiz",
+    "Admin Login": "views.admin",
+    "Admin Dashboard": "views.dashboard",
+}
+DEFAULT_PAGE = "Home"
+SLOW_RENDER_SECONDS = 2.0
+TIMING_WINDOW = 200
+
+log = logging.getLogger(__name__)
+
+_modules = {}
+
+
+class PageTimings:
+    """Thread-safe render times per page, over the last TIMING_WINDOW renders of each."""
+
+    def __init__(self, window=TIMING_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._pages = {}
+
+    def record(self, name, seconds, load_seconds=0.0):
+        with self._lock:
+            page = self._pages.setdefault(name, {"count": 0, "max": 0.0, "load": 0.0,
+                                                 "recent": deque(maxlen=self.window)})
+            page["count"] += 1
+            page["max"] = max(page["max"], seconds)
+            page["load"] = max(page["load"], load_seconds)
+            page["recent"].append(seconds)
+
+    def snapshot(self):
+        """{page: {"count", "avg", "p95", "max", "load"}}; avg and p95 cover the recent window."""
+        with self._lock:
+            pages = {name: (dict(page), sorted(page["recent"])) for name, page in self._pages.items()}
+        return {
+            name: {
+                "count": page["count"],
+                "avg": sum(recent) / len(recent),
+                "p95": recent[min(len(recent) - 1, int(len(recent) * 0.95))],
+                "max": page["max"],
+                "load": page["load"],
+            }
+            for name, (page, recent) in pages.items()
+        }
+
+
+@st.cache_resource(show_spinner=False)
+def page_timings():
+    return PageTimings()
+
+
+def load_page(name):
+    """Import a page's module on first use; later calls reuse it."""
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = importlib.import_module(PAGES[name])
+    return module
+
+
+def render_page(name):
+    """Render a registered page (unknown names fall back to the home page) inside a timing span."""
+    if name not in PAGES:
+        name = DEFAULT_PAGE
+    started = time.perf_counter()
+    module = load_page(name)
+    loaded = time.perf_counter()
+    try:
+        with profiler.profiled(name):
+            module.render()
+    finally:
+        # st.rerun() and st.stop() end a render by raising; those renders still count.
+        seconds = time.perf_counter() - loaded
+        page_timings().record(name, seconds, load_seconds=loaded - started)
+        metrics.observe("page_render_seconds", seconds, page=name)
+        if seconds > SLOW_RENDER_SECONDS:
+            log.warning("Page %r took %.2fs to render", name, seconds)
@@ -0,0 +1,297 @@
+"""Admin login, uploads and the delete panel."""
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+import preview
+import profiler
+from catalog import fetch_catalog_page, invalidate_table
+from db import get_supabase
+from ingest import delete_documents, ingest_documents
+from views import PAGES
+from views.common import format_size, paginate
+
+ADMIN_USERNAME = st.secrets["admin"]["username"]
+ADMIN_PASSWORD = st.secrets["admin"]["password"]
+
+
+# Login function
+def login():
+    with st.form("admin_login"):
+        st.subheader("🔐 Admin Login")
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+        submitted = st.form_submit_button("Login")
+        if submitted:
+            if username == ADMIN_USERNAME and password == ADMIN_PASSWORD:
+                st.session_state.logged_in = True
+                st.session_state.login_attempted = True
+                st.rerun()
+            else:
+                st.error("❌ Invalid credentials.")
+
+
+# Logout function
+def logout():
+    st.session_state.logged_in = False
+    st.session_state.login_attempted = True
+    st.success("🔐 Logged out")
+    st.rerun()
+
+# Utility function to preview a PDF file
+def preview_pdf(file_bytes):
+    st.markdown("*Preview:*")
+    st.download_button("📥 Download PDF", data=file_bytes, file_name="preview.pdf", mime="application/pdf",
+                       key=f"preview_{datetime.now().isoformat()}")
+
+def upload_documents(table, files, filters, branches=(), optimize=False):
+    """Run the bulk ingest pipeline for the selected files behind a single progress bar."""
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+
+    def on_progress(fraction, message):
+        progress_bar.progress(min(fraction, 1.0))
+        status_text.text(message)
+
+    results = ingest_documents(get_supabase(), table, [(file.name.strip(), file.read()) for file in files],
+                               filters, branches=branches, optimize=optimize, progress=on_progress)
+    invalidate_table(table)
+
+    for result in results:
+        report = result["report"]
+        if report:
+            with st.expander(f"🗜 {result['file']}: {format_size(report['original_size'])} → "
+                             f"{format_size(report['final_size'])} in {report['total_seconds']:.1f}s"):
+                st.dataframe(report["pages"], use_container_width=True)
+    st.dataframe([{key: result[key] for key in ("file", "status", "detail")} for result in results],
+                 use_container_width=True)
+    uploaded = sum(result["status"] == "uploaded" for result in results)
+    st.success(f"🎉 All files processed: {uploaded} of {len(results)} uploaded.")
+
+DELETE_TABLES = {"Question Papers": "pdfs", "Subject Notes": "subject_notes", "Assignments": "assignments"}
+
+
+def find_documents_page(table, search_query, after_id=None):
+    # Escape LIKE wildcards so a filename like "unit_1" matches literally.
+    pattern = search_query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    query = get_supabase().table(table).select("id, filename, size, uploaded_at", count="exact")
+    if pattern:
+        query = query.ilike("filename", f"%{pattern}%")
+    return fetch_catalog_page(query, after_id)
+
+
+def delete_panel(table, search_query):
+    """Paginated filename search with multi-select bulk delete."""
+    try:
+        page = paginate("delete_pager", (table, search_query),
+                        lambda cursor: find_documents_page(table, search_query, cursor))
+    except Exception as e:
+        st.error(f"Error searching {table}: {e}")
+        return
+    files = {file["id"]: file for file in page["rows"]}
+    if not files:
+        st.info("No files match this search.")
+        return
+
+    st.caption(f"{page['total'] or len(files)} matching file(s)")
+    select_all = st.checkbox("Select every file on this page", key=f"delete_all_{table}")
+    selected = st.multiselect(
+        "Files to delete", list(files), default=list(files) if select_all else [],
+        format_func=lambda file_id: f"{files[file_id]['filename']} ({format_size(files[file_id].get('size'))})",
+        key=f"delete_selected_{table}_{select_all}")
+    confirm = st.checkbox(f"Are you sure you want to delete {len(selected)} file(s)?", key=f"delete_confirm_{table}")
+    if st.button(f"❌ Delete {len(selected)} selected", disabled=not selected or not confirm):
+        try:
+            deleted, released = delete_documents(get_supabase(), table, selected)
+        except Exception as e:
+            st.error(f"Delete failed: {e}")
+            return
+        for file in deleted:
+            preview.forget_document(table, file["id"])
+        invalidate_table(table)
+        st.session_state.pop("delete_pager", None)
+        st.success(f"Deleted {len(deleted)} file(s); {len(released)} stored blob(s) freed")
+        st.rerun()
+
+
+def profiler_controls():
+    """Sidebar controls to profile the next few renders of a page in this session."""
+    page = st.sidebar.selectbox("Page to profile", list(PAGES), key="profile_target")
+    reruns = st.sidebar.number_input("Renders", min_value=1, max_value=20, value=3, key="profile_reruns")
+    if st.sidebar.button(f"▶️ Profile next {reruns} render(s)"):
+        profiler.arm(page, reruns)
+    left = profiler.remaining()
+    if left:
+        st.sidebar.caption(f"Armed: {left} render(s) of {st.session_state.profile_page} left")
+        if st.sidebar.button("⏹ Stop profiling"):
+            profiler.disarm()
+            st.rerun()
+
+
+def profiles_panel():
+    st.header("🔬 Profiles")
+    names = profiler.list_profiles()
+    if not names:
+        st.info("No profiles saved yet. Arm the profiler in the sidebar, then open the page.")
+        return
+    last = st.session_state.get("profile_last")
+    name = st.selectbox("Profile", names, index=names.index(last) if last in names else 0,
+                        format_func=profiler.describe, key="profile_selected")
+    try:
+        rows = profiler.hotspots(name)
+        total = profiler.total_seconds(name)
+        with open(profiler.profile_path(name), "rb") as f:
+            raw = f.read()
+    except Exception as e:
+        st.error(f"Could not read {name}: {e}")
+        return
+    st.caption(f"{total * 1000:.0f} ms profiled. Top functions by cumulative time:")
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    col1, col2 = st.columns(2)
+    col1.download_button("📥 Download .prof (pstats, snakeviz)", raw, file_name=name,
+                         mime="application/octet-stream")
+    col2.download_button("🔥 Download collapsed stacks (flamegraph)", profiler.collapsed_stacks(name),
+                         file_name=name.replace(".prof", ".folded"), mime="text/plain")
+
+
+def uploader_and_admin_ui():
+    st.header("📄 Admin Panel: Upload PDFs or Subject Notes or Assignments")
+    upload_type = st.selectbox("Upload Type", ["📝 Question Papers", "📘 Subject Notes", "📂 Assignment's", "🧠 Aptitude Test", "🧩 Weekly Quiz"])
+    if upload_type == "📝 Question Papers":
+        selected_branches = st.multiselect("Select Branch(es)",["CSE", "CSE AI", "CSE AI & ML", "CSE DS", "CSE CYB", "IT", "ECE", "EEE","Mech", "Civil"])
+        reg = st.selectbox("Regulation", ["R19", "R20", "R23"])
+        year = st.selectbox("Year", ["1st Year", "2nd Year", "3rd Year", "4th Year"])
+        sem = st.selectbox("Semester", ["1 Semester", "2 Semester"])
+        paper_type = st.selectbox("Paper Type", ["Regular", "Supplementary"])
+        files = st.file_uploader("📄 Choose PDF files to upload", type=["pdf"], accept_multiple_files=True)
+        optimize = st.checkbox("🗜 Optimize PDFs before upload", key="optimize_papers")
+
+        if files and selected_branches and st.button("Upload Question Papers"):
+            filters = {
+                "regulation": reg,
+                "year": year,
+                "semester": sem,
+                "type": paper_type.lower()
+            }
+            upload_documents("pdfs", files, filters, branches=selected_branches, optimize=optimize)
+    elif upload_type == "📘 Subject Notes":
+        subject = st.text_input("Subject Name").strip().title()
+        reg = st.selectbox("Regulation", ["R19", "R20", "R23"], key="reg_notes")
+        year = st.selectbox("Year", ["1st Year", "2nd Year", "3rd Year", "4th Year"], key="year_notes")
+        files = st.file_uploader("📄 Choose Subject Note PDFs to upload", type=["pdf"], key="subject_note_file", accept_multiple_files=True)
+        optimize = st.checkbox("🗜 Optimize PDFs before upload", key="optimize_notes")
+
+        if files and st.button("Upload Subject Notes"):
+            filters = {
+                "subject": subject,
+                "year": year,
+                "regulation": reg
+            }
+            upload_documents("subject_notes", files, filters, optimize=optimize)
+    elif upload_type == "📂 Assignment's":
+        branch = st.selectbox("Select Your Branch",["CSE", "CSE AI", "CSE AI & ML", "CSE DS", "CSE CYB", "IT", "ECE", "EEE", "Mech", "Civil"])
+        year = st.selectbox("Select Your Year", ["1st Year", "2nd Year", "3rd Year", "4th Year"])
+        semester = st.selectbox("Select Your Semester", ["1 Semester", "2 Semester"])
+        unit = st.selectbox("Select Unit", ["1st Unit", "2nd Unit", "3(A) Unit", "3(B) Unit", "4th Unit", "5th Unit"])
+        subject = st.text_input("Subject Name").strip().title()
+        files = st.file_uploader("📄 Choose Assignment PDFs to upload", type=["pdf"], accept_multiple_files=True)
+        optimize = st.checkbox("🗜 Optimize PDFs before upload", key="optimize_assignments")
+        if files and st.button("Upload Assignments"):
+            filters = {
+                "branch": branch,
+                "year": year,
+                "semester": semester,
+                "subject": subject,
+                "unit": unit
+            }
+            upload_documents("assignments", files, filters, optimize=optimize)
+
+    elif upload_type == "🧠 Aptitude Test":
+        st.subheader("Upload Aptitude Test Details")
+        year = st.selectbox("Select Your Year", ["1st Year", "2nd Year", "3rd Year", "4th Year"])
+        title = st.text_input("Test Title")
+        description = st.text_area("Test Description")
+        topics = st.text_area("Topics Covered (comma separated)")
+        duration = st.text_input("Duration (e.g., 30 minutes)")
+        total_questions = st.number_input("Total Questions", min_value=1, step=1)
+        form_link = st.text_input("Google Form Link (URL)")
+        expiry_hours = st.number_input("Expiry time in hours (after which test will be deleted)", min_value=1, step=1,value=24)
+        if st.button("Upload Aptitude Test Info"):
+            if not all([year, title, description, topics, duration, total_questions, form_link]):
+                st.warning("Please fill all fields before uploading.")
+            else:
+                try:
+                    expire_at = (datetime.now() + timedelta(hours=expiry_hours)).isoformat()
+                    get_supabase().table("aptitude_test").insert({
+                        "year": year,
+                        "title": title.strip(),
+                        "description": description.strip(),
+                        "topics": topics.strip(),
+                        "duration": duration.strip(),
+                        "total_questions": total_questions,
+                        "form_link": form_link.strip(),
+                        "uploaded_at": datetime.now().isoformat(),
+                        "expire_at": expire_at
+                    }).execute()
+                    invalidate_table("aptitude_test")
+                    st.success("✅ Aptitude test info uploaded successfully!")
+                except Exception as e:
+                    st.error(f"❌ Failed to upload aptitude test info: {e}")
+
+    elif upload_type == "🧩 Weekly Quiz":
+        st.subheader("Upload Weekly Quiz")
+        year = st.selectbox("Select Year", ["1st Year", "2nd Year", "3rd Year", "4th Year"])
+        semester = st.selectbox("Select Semester", ["1 Semester", "2 Semester"])
+        branch = st.selectbox("Select Branch",["CSE", "CSE AI", "CSE AI & ML", "CSE DS", "CSE CYB", "IT", "ECE", "EEE", "Mech","Civil"])
+        title = st.text_input("Quiz Title")
+        description = st.text_input("Quiz Description")
+        topics = st.text_area("Topics Covered (comma separated)")
+        duration = st.text_input("Duration (e.g., 20 minutes)")
+        total_questions = st.number_input("Total Questions", min_value=1, step=1)
+        form_link = st.text_input("Google Form Link (URL)")
+        if st.button("Upload Weekly Quiz Info"):
+            if not all([year, semester, branch, title, description, topics, duration, total_questions, form_link]):
+                st.warning("Please fill all fields before uploading.")
+            else:
+                try:
+                    expire_at = (datetime.now() + timedelta(days=7)).isoformat()
+                    get_supabase().table("weekly_quiz").insert({
+                        "year": year,
+                        "semester": semester,
+                        "branch": branch,
+                        "title": title.strip(),
+                        "description": description.strip(),
+                        "topics": topics.strip(),
+                        "duration": duration.strip(),
+                        "total_questions": total_questions,
+                        "form_link": form_link.strip(),
+                        "uploaded_at": datetime.now().isoformat(),
+                        "expire_at": expire_at
+                    }).execute()
+                    invalidate_table("weekly_quiz")
+
+                    st.success("✅ Weekly quiz info uploaded successfully!")
+
+                except Exception as e:
+                    st.error(f"❌ Failed to upload weekly quiz info: {e}")
+
+
+def render():
+    if not st.session_state.logged_in:
+        login()
+        return
+    uploader_and_admin_ui()
+    if st.sidebar.button("📊 Dashboard"):
+        st.session_state.page = "Admin Dashboard"
+        st.rerun()
+    if st.sidebar.button("Logout"):
+        logout()
+    profiling = st.sidebar.toggle("🔬 Profiler", key="profiler_enabled")
+    if profiling:
+        profiler_controls()
+    st.header("🗑 Delete Uploaded PDFs")
+    delete_type = st.selectbox("Select Table to Manage", list(DELETE_TABLES), key="delete_table")
+    search_query = st.text_input("🔍 Search by filename to delete...", key="delete_search").strip()
+    delete_panel(DELETE_TABLES[delete_type], search_query)
+    if profiling:
+        profiles_panel()
@@ -0,0 +1,125 @@
+"""The latest aptitude test for a year."""
+from datetime import datetime
+
+import streamlit as st
+
+from catalog import get_latest_aptitude_test, table_version
+
+
+def render():
+    if st.session_state.get("page") == "Aptitude Test":
+        year = st.selectbox("Select Your Year", ["--", "1st Year", "2nd Year", "3rd Year", "4th Year"])
+        if year == "--":
+            st.warning("Please select your year to continue.")
+            return
+
+        try:
+            with st.spinner("Fetching latest aptitude test..."):
+                test = get_latest_aptitude_test(year, version=table_version("aptitude_test"))
+
+            if test:
+                title = test.get("title", "Aptitude Test")
+                description = test.get("description", "")
+                topics = test.get("topics", "")
+                duration = test.get("duration", "N/A")
+                total_questions = test.get("total_questions", "N/A")
+                form_link = test.get("form_link", "#")
+
+                expire_at = test.get("expire_at")
+                if expire_at:
+                    expire_dt = datetime.fromisoformat(expire_at)
+                    expire_str = expire_dt.strftime("%d %b %Y, %I:%M %p")
+                else:
+                    expire_str = "N/A"
+
+                # --- Page Styling ---
+                st.markdown(
+                    """
+                    <style>
+                    .main-heading {
+                        font-size: 2.8rem;
+                        font-weight: 700;
+                        color: #3f51b5;
+                        margin-bottom: 0.2rem;
+                    }
+                    .subheading {
+                        font-size: 1.25rem;
+                        color: #555;
+                        margin-bottom: 1.5rem;
+                        font-style: italic;
+                        background: none !important;
+                        border: none !important;
+                        padding: 0 !important;
+                        box-shadow: none !important;
+                    }
+                    .topics-list li {
+                        font-size: 1.1rem;
+                        margin-bottom: 0.3rem;
+                        color: #212121;
+                    }
+                    .start-btn {
+                        background-color: #3f51b5;
+                        color: white;
+                        padding: 0.8rem 2.5rem;
+                        font-size: 1.15rem;
+                        border: none;
+                        border-radius: 10px;
+                        cursor: pointer;
+                        transition: background-color 0.3s ease;
+                        box-shadow: 0 4px 8px rgba(63,81,181,0.2);
+                    }
+                    .start-btn:hover {
+                        background-color: #303f9f;
+                    }
+                    .info-text {
+                        font-size: 1rem;
+                        color: #333;
+                        margin-top: 1rem;
+                        line-height: 1.5;
+                    }
+                    </style>
+                    """,
+                    unsafe_allow_html=True
+                )
+
+                st.markdown(f'<h1 class="main-heading">🧠 {title}</h1>', unsafe_allow_html=True)
+                st.markdown(f'<p class="subheading">{description}</p>', unsafe_allow_html=True)
+
+                # Topics as bullet list
+                if topics:
+                    st.markdown('<h3 class="topics-title">Topics Covered</h3>', unsafe_allow_html=True)
+                    topics_html = "<ul class='topics-list'>"
+                    for topic in topics.split(","):
+                        topics_html += f"<li>{topic.strip()}</li>"
+                    topics_html += "</ul>"
+                    st.markdown(topics_html, unsafe_allow_html=True)
+
+                # Additional info including expire time
+                st.markdown(
+                    f"""
+                    <p class="info-text">
+                        ⏱ <strong>Duration:</strong> {duration}<br>
+                        📊 <strong>Total Questions:</strong> {total_questions}<br>
+                        ⏳ <strong>Expires On:</strong> {expire_str}
+                    </p>
+                    """,
+                    unsafe_allow_html=True
+                )
+
+                # Start button centered
+                st.markdown(
+                    f"""
+                    <div style="text-align:center; margin-top: 2rem;">
+                        <a href="{form_link}" target="_blank" rel="noopener noreferrer">
+                            <button class="start-btn">🚀 Start Aptitude Test</button>
+                        </a>
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+            else:
+                st.info("No aptitude test info available yet for the selected year. Please check back later.")
+
+        except Exception as e:
+            st.error("Error fetching aptitude test info.")
+            st.exception(e)
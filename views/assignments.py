@@ -0,0 +1,54 @@
+"""Assignments: filters, search and downloads."""
+import streamlit as st
+
+from catalog import apply_search, get_assignments, get_assignments_page, list_page, table_version
+from views.common import (file_url, format_pages, format_size, paginate, record_search, show_snippet,
+                          show_suggestions)
+
+
+def render():
+    st.markdown("<h1 class='main-heading'>📂 Assignments</h1>", unsafe_allow_html=True)
+    with st.form("filter_form"):
+        branch = st.selectbox("Select Your Branch",["--", "CSE", "CSE AI", "CSE AI & ML", "CSE DS", "CSE CYB", "IT", "ECE", "EEE", "Mech","Civil"], key="assign_branch")
+        year = st.selectbox("Select Your Year", ["--", "1st Year", "2nd Year", "3rd Year", "4th Year"], key="assign_year")
+        sem = st.selectbox("Select Your Semester", ["--", "1 Semester", "2 Semester"], key="assign_semester")
+        unit = st.selectbox("Select Unit", ["--", "1st Unit", "2nd Unit", "3(A) Unit", "3(B) Unit", "4th Unit", "5th Unit"],key="assign_unit")
+        subject = st.text_input("Enter Subject Name", key="assign_subject").strip().lower()
+        st.form_submit_button("🚀 Proceed")
+
+    if branch == "--" or year == "--" or sem == "--":
+        st.warning("Please select Branch, Year and Semester")
+        return
+
+    # Unit is filtered server-side; subject goes through the search index.
+    filters = (branch, year, sem, unit, subject)
+    try:
+        if subject:
+            assignments = get_assignments(branch, year, sem, unit, version=table_version("assignments"))
+            matches = apply_search(assignments, subject, "assignments", name_fields=("subject", "filename"),
+                                   branch=branch, year=year, semester=sem)
+            page = paginate("assignments_pager", filters, lambda offset: list_page(matches, offset))
+        else:
+            page = paginate("assignments_pager", filters, lambda cursor: get_assignments_page(
+                branch, year, sem, unit, after_id=cursor, version=table_version("assignments")))
+    except Exception as e:
+        st.error(f"Error fetching assignments: {e}")
+        return
+
+    filtered = page["rows"]
+    record_search("assignments", "assignments", subject, page["total"])
+    if filtered:
+        st.success(f"Found {page['total'] or len(filtered)} assignment(s)")
+    else:
+        st.warning("No assignments found.")
+        if subject:
+            show_suggestions(subject)
+
+    for assignment in filtered:
+        display_name = assignment.get("filename", "Unnamed")
+        subj = assignment.get("subject", "N/A")
+        unit_disp = assignment.get("unit", "N/A")
+        st.write(f"{display_name} — Subject: {subj} — Unit: {unit_disp} — "
+                 f"{format_pages(assignment.get('page_count'))}{format_size(assignment.get('size'))}")
+        show_snippet(assignment.get("snippet"))
+        st.link_button("📥 Download Assignment", file_url("assignments", assignment["id"]))
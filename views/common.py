@@ -0,0 +1,119 @@
+"""Widgets and formatting shared by several pages."""
+import streamlit as st
+import streamlit.components.v1 as components
+from streamlit_lottie import st_lottie
+
+import telemetry
+from catalog import PAGE_SIZE, fuzzy_index
+from lottie_assets import get_animation, player_html
+
+# Downloads are served by file_server.py so PDFs never enter a session's media store.
+FILE_SERVER_URL = st.secrets.get("files", {}).get("base_url", "http://localhost:8502").rstrip("/")
+
+# Animations are optimized once per process; "static" mode lets browsers fetch and cache them.
+LOTTIE_MODE = st.secrets.get("assets", {}).get("lottie_mode", "inline")
+
+
+def show_animation(name, height, key):
+    """Render one of the optimized Lottie animations; False if it could not be loaded."""
+    if get_animation(name) is None:
+        return False
+    if LOTTIE_MODE == "static":
+        components.html(player_html(f"{FILE_SERVER_URL}/assets/{name}.json", height), height=height)
+    else:
+        st_lottie(get_animation(name)["data"], height=height, key=key, quality="high", speed=1)
+    return True
+
+
+def show_pdf_preview(table, doc_id):
+    """Render a document one page image at a time instead of inlining the whole PDF."""
+    import preview
+    try:
+        pages = preview.page_count(table, doc_id)
+        if not pages:
+            st.error("This file is no longer available.")
+            return
+        page = st.number_input(f"Page (1–{pages})", min_value=1, max_value=pages, value=1,
+                               key=f"preview_page_{table}_{doc_id}")
+        st.image(preview.render_page(table, doc_id, page - 1), caption=f"Page {page} of {pages}",
+                 use_container_width=True)
+    except Exception as e:
+        st.error(f"Error previewing PDF: {e}")
+
+
+def format_pages(page_count):
+    if page_count is None:
+        return ""
+    return f"{page_count} page{'s' if page_count != 1 else ''} · "
+
+
+def format_size(num_bytes):
+    if not num_bytes:
+        return "—"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.0f} KB"
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def file_url(table, file_id, inline=False):
+    url = f"{FILE_SERVER_URL}/files/{table}/{file_id}"
+    return f"{url}?inline=1" if inline else url
+
+
+def thumbnail_url(thumb_hash):
+    return f"{FILE_SERVER_URL}/thumbs/{thumb_hash}"
+
+
+def show_suggestions(search_term):
+    """Offer close subject and file names from every document table when a search finds nothing."""
+    try:
+        hits = fuzzy_index().search(search_term, limit=5)
+    except Exception:
+        return
+    names = list(dict.fromkeys(subject or filename for _, _, _, filename, subject in hits))
+    if names:
+        st.info("Did you mean: " + ", ".join(f"**{name}**" for name in names))
+
+
+def record_search(view, table, search_term, results):
+    # Reruns repeat the same search on every widget change; record it once per view and term.
+    key = f"{view}_recorded_search"
+    if not search_term:
+        st.session_state.pop(key, None)
+    elif st.session_state.get(key) != search_term:
+        st.session_state[key] = search_term
+        telemetry.record("search", table, session_id=st.session_state.session_id, query=search_term,
+                         results=results)
+
+
+def show_snippet(snippet):
+    if snippet:
+        st.caption("…" + snippet.replace("<b>", "**").replace("</b>", "**") + "…")
+
+
+def paginate(key, filters, fetch_page):
+    """Render Previous/Next controls and return the current page from fetch_page(cursor).
+
+    Cursors of the pages already visited are kept in session state, so going back
+    re-reads a cached page instead of walking the result set again; they reset
+    whenever the filters change.
+    """
+    state = st.session_state.get(key)
+    if state is None or state["filters"] != filters:
+        state = st.session_state[key] = {"filters": filters, "cursors": [None], "total": None}
+    page = fetch_page(state["cursors"][-1])
+    if page["total"] is not None:
+        state["total"] = page["total"]
+
+    page_number = len(state["cursors"])
+    if page_number > 1 or page["next"] is not None:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        if prev_col.button("◀ Previous", key=f"{key}_prev", disabled=page_number == 1):
+            state["cursors"].pop()
+            st.rerun()
+        pages = f" of {-(-state['total'] // PAGE_SIZE)}" if state["total"] else ""
+        info_col.caption(f"Page {page_number}{pages}")
+        if next_col.button("Next ▶", key=f"{key}_next", disabled=page["next"] is None):
+            state["cursors"].append(page["next"])
+            st.rerun()
+    return {**page, "total": state["total"]}
@@ -0,0 +1,115 @@
+"""Admin dashboard: catalog counts, usage and trends."""
+from datetime import datetime, timedelta
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from catalog import STATS_TABLES, get_catalog_stats, get_monthly_trends, table_version
+from views import page_timings
+from views.common import format_size
+
+
+def admin_dashboard():
+    st.markdown("<h1 class='main-heading'>📊 Admin Dashboard </h1>", unsafe_allow_html=True)
+
+    try:
+        stats = get_catalog_stats(tuple(table_version(table) for table in STATS_TABLES))
+    except Exception as e:
+        st.error(f"Error fetching statistics: {e}")
+        return
+
+    def count(table, field="total"):
+        return (stats.get(table) or {}).get(field) or 0
+
+    storage_bytes = sum(count(table, "total_bytes") for table in ("pdfs", "subject_notes", "assignments"))
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="📄 Question Papers Uploaded", value=count("pdfs"))
+        st.metric(label="🧩 Active Weekly Quizzes", value=count("weekly_quiz", "active"))
+    with col2:
+        st.metric(label="📘 Subject Notes Uploaded", value=count("subject_notes"))
+        st.metric(label="🧠 Active Aptitude Tests", value=count("aptitude_test", "active"))
+    with col3:
+        st.metric(label="📂 Assignments Uploaded", value=count("assignments"))
+        st.metric(label="💾 Documents Stored", value=format_size(storage_bytes))
+
+    col1, col2, col3 = st.columns(3)
+    for column, event_type, label in ((col1, "download", "⬇️ Downloads"), (col2, "preview", "👁 Previews"),
+                                      (col3, "search", "🔍 Searches")):
+        recent = (stats.get(event_type) or {}).get("recent")
+        column.metric(label=label, value=count(event_type), delta=f"{recent} this week" if recent else None)
+
+    st.markdown("---")
+    st.subheader("📈 Upload & Download Statistics")
+
+    # Bar chart using Plotly
+    stats_df = pd.DataFrame({
+        "Category": ["Question Papers", "Subject Notes", "Assignments", "Weekly Quizzes", "Aptitude Tests",
+                     "Downloads"],
+        "Count": [count(table) for table in STATS_TABLES] + [count("download")]
+    })
+
+    fig_bar = px.bar(stats_df, x="Category", y="Count", color="Category",
+                     title="Current Counts by Category",
+                     text="Count",
+                     labels={"Count": "Total", "Category": "Category"},
+                     template="plotly_white")
+    fig_bar.update_traces(textposition='outside')
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("📅 Monthly Upload Trends")
+
+    # Twelve calendar months up to the current one, read from the monthly rollups in one query.
+    since = (datetime.now().replace(day=1) - timedelta(days=330)).replace(day=1).date()
+    months = pd.date_range(since, periods=12, freq="MS")
+    try:
+        trends = pd.DataFrame(get_monthly_trends(since.isoformat(), tuple(table_version(table) for table in STATS_TABLES)),
+                              columns=["bucket", "table_name", "metric", "count"])
+    except Exception as e:
+        st.error(f"Error fetching trends: {e}")
+        return
+    trends["bucket"] = pd.to_datetime(trends["bucket"])
+
+    def monthly(metric, table=None):
+        rows = trends[(trends["metric"] == metric) & ((trends["table_name"] == table) if table else True)]
+        return rows.groupby("bucket")["count"].sum().reindex(months, fill_value=0)
+
+    fig_line = go.Figure()
+    for name, metric, table in (("Question Papers", "uploads", "pdfs"), ("Subject Notes", "uploads", "subject_notes"),
+                                ("Assignments", "uploads", "assignments"), ("Downloads", "download", None)):
+        fig_line.add_trace(go.Scatter(x=months.strftime("%b %Y"), y=monthly(metric, table), mode='lines+markers',
+                                      name=name))
+
+    fig_line.update_layout(
+        title="Monthly Upload and Download Trends",
+        xaxis_title="Month",
+        yaxis_title="Count",
+        hovermode="x unified",
+        template="plotly_white"
+    )
+    st.plotly_chart(fig_line, use_container_width=True)
+
+
+def show_page_timings():
+    rows = [{"Page": name, "Renders": stats["count"], "Avg ms": round(stats["avg"] * 1000),
+             "p95 ms": round(stats["p95"] * 1000), "Max ms": round(stats["max"] * 1000),
+             "Load ms": round(stats["load"] * 1000)}
+            for name, stats in page_timings().snapshot().items()]
+    if rows:
+        st.dataframe(sorted(rows, key=lambda row: -row["p95 ms"]), use_container_width=True, hide_index=True)
+    else:
+        st.info("No pages rendered yet in this process.")
+
+
+def render():
+    if not st.session_state.logged_in:
+        st.warning("Please login as admin to access this dashboard.")
+        return
+    admin_dashboard()
+    st.markdown("---")
+    st.subheader("⏱ Page Render Times (this process)")
+    show_page_timings()
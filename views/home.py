@@ -0,0 +1,181 @@
+"""Home page: quick links, study tips and live catalog numbers."""
+import streamlit as st
+
+from catalog import STATS_TABLES, get_catalog_stats, table_version
+from views.common import show_animation
+
+
+def render():
+    # Enhanced custom styling for better UX: softer colors, hover effects, and responsiveness
+    st.markdown("""
+        <style>
+            .main-header {
+                text-align: center;
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                font-size: 2rem;
+                color: #0f62fe; 
+                background: linear-gradient(to right, #f0f7ff, #ffffff);
+                padding: 12px 18px;
+                border-radius: 15px;
+                box-shadow: 0 4px 15px rgba(0, 0, 0, 0.08);
+                margin-bottom: 1.5rem;
+                transition: box-shadow 0.3s ease;  /* Subtle hover effect */
+            }
+            .main-header:hover {
+                box-shadow: 0 6px 20px rgba(0, 0, 0, 0.12);
+            }
+            .stButton > button,.stDownloadButton > button {
+                border: 1px solid #555;
+                background-color: #5c6bc0;
+                color: white !important;
+                font-weight: 600;
+                padding: 10px 24px;
+                border-radius: 12px;
+                transition: background-color 0.3s ease, box-shadow 0.3s ease;
+                width: 100%;
+                margin-bottom: 10px;
+        
+            }
+            .stButton > button:hover,.stDownloadButton > button:hover {
+                border:rgba(239, 239, 240, 0.41) solid 1px;
+                outline:none !important;
+                 background: linear-gradient(135deg, #454cc6 2%, #8b90f1 98%);
+                 box-shadow: 5px 8px 12px rgba(148, 152, 235, 0.4);
+                 color: #ffffff !important;
+            }
+            @media (max-width: 768px) {
+                .main-header { font-size: 1.8rem; }  /* Responsive font sizing */
+            }
+        </style>
+    """, unsafe_allow_html=True)
+
+    # Hero/Welcome: More balanced layout, added subtle animation on load
+    col1, col2 = st.columns([0.6, 0.4], gap="medium")  # Adjusted ratios for better mobile stacking
+    with col1:
+        st.markdown("""<div class='main-header'>🎓 Pragati's Exam Buddy</div>""", unsafe_allow_html=True)
+        st.markdown(
+            "Your personalized academic companion. Prepare for exams, manage tasks, and build skills with ease and confidence."
+        )
+        st.markdown(
+            "*Consistency leads to progress—let's make today count.*"
+        )
+    with col2:
+        show_animation("hero", 180, key="hero_animation")  # Slightly larger for impact
+
+    st.divider()
+
+    # Personalized nudge: Added a progress hint for returnees
+    if st.session_state.get("user_first_visit", True):
+        st.info("👋 First time here? Explore all tools and features designed to make your academic journey smoother.")
+        st.session_state.user_first_visit = False
+    else:
+        sessions = st.session_state.get("user_sessions", 0) + 1  # Simple session counter
+        st.session_state.user_sessions = sessions
+        st.success("🎯 Welcome back! Keep up the momentum and stay on track with your goals.")
+
+    # Study Actions: Card-based with tooltips and progress overview
+    st.subheader("🎯 Learning Dashboard")
+    st.caption("Focus on what matters—track your progress at a glance.")
+
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        with st.container(border=True):
+            st.markdown("#### 📄 Previous Exam Papers")
+            st.caption("Explore patterns and topics from real exams.")
+            if st.button("Browse Papers", key="qp", use_container_width=True, help="View past papers and solutions"):
+                st.session_state.page = "Question Papers"
+                st.session_state.papers_reviewed = st.session_state.get("papers_reviewed", 0) + 1
+                st.rerun()
+    with col_b:
+        with st.container(border=True):
+            st.markdown("#### 📘 Subject Notes")
+            st.caption("Quick, focused revisions for better retention.")
+            if st.button("Open Notes", key="notes", use_container_width=True,
+                         help="Access curated notes and summaries"):
+                st.session_state.page = "Subject Notes"
+                st.session_state.notes_accessed = st.session_state.get("notes_accessed", 0) + 1
+                st.rerun()
+    with col_c:
+        with st.container(border=True):
+            st.markdown("#### 📂 Assignment Pdf's")
+            st.caption("Organize and submit with deadlines in mind.")
+            if st.button("View Assignments", key="assignments", use_container_width=True,
+                         help="Manage your tasks and uploads"):
+                st.session_state.page = "Assignments"
+                st.session_state.assignments_done = st.session_state.get("assignments_done", 0) + 1
+                st.rerun()
+
+    st.divider()
+
+    # Practice & Performance: Added progress bar for streaks
+    st.subheader("🚀 Practice & Build Skills")
+    st.caption("Track improvements and stay motivated.")
+
+    col_x, col_y = st.columns(2)
+    with col_x:
+        with st.container(border=True):
+            st.markdown("#### 🧩 Weekly Challenge Quiz")
+            st.caption("Build habits through consistent testing.")
+            streak = st.session_state.get("quiz_streak", 0)
+            if streak > 0:
+                st.progress(streak / 10.0)  # Visual streak progress (max 10 for scaling)
+                st.info(f"🔥 {streak}-week streak! Aim higher.", icon="🌟")
+            if st.button("Start Quiz", key="quiz", use_container_width=True, help="Test your knowledge now"):
+                st.session_state.page = "Weekly Quiz"
+                st.session_state.quiz_streak = streak + 1
+                st.rerun()
+    with col_y:
+        with st.container(border=True):
+            st.markdown("#### 🧠 Aptitude Practice")
+            st.caption("Sharpen skills for placements and beyond.")
+            if st.button("Begin Practice", key="aptitude", use_container_width=True,
+                         help="Practice problems with hints"):
+                st.session_state.page = "Aptitude Test"
+                st.rerun()
+
+    # Stress Cope: Kept empathetic, added a quick action button
+    st.divider()
+    with st.expander("💬 Managing Exam Stress", expanded=False):
+        st.markdown("- **Break it down:** Turn big goals into small, achievable steps.")
+        st.markdown("- **Breathe easy:** Try 4-7-8 breathing for instant calm.")
+        st.markdown("- **Short breaks:** Every 45 minutes, stretch or walk for 5 mins.")
+        st.markdown("*Remember, progress over perfection—you're capable!*")
+        if st.button("Get Personalized Tips", key="stress_tips"):
+            st.info("Tip: Journal one win from today to build positivity.")
+
+    st.divider()
+    st.markdown("#### 📊 Content Insights")
+    st.caption("Here’s what’s currently available in Pragati’s Exam Buddy — regularly updated to support your academic journey.")
+    try:
+        stats = get_catalog_stats(tuple(table_version(table) for table in STATS_TABLES))
+    except Exception:
+        stats = {}
+    kpi1, kpi2, kpi3 = st.columns(3)
+    for column, table, label in ((kpi1, "pdfs", "📄 Question Papers Available"),
+                                 (kpi2, "subject_notes", "📝 Subject Notes Available"),
+                                 (kpi3, "assignments", "📂 Assignments Available")):
+        row = stats.get(table) or {}
+        recent = row.get("recent")
+        column.metric(label, row.get("total", "—"), delta=f"📥 {recent} added this week" if recent else None)
+
+
+    with st.expander("Detailed Breakdown"):
+        st.markdown("- **Quizzes:** Focus on weak areas for targeted improvement.")
+        st.markdown("- **Community:** You're part of 5000+ students thriving together.")
+
+    st.divider()
+    st.markdown("#### ℹ️ About")
+    st.markdown(
+        "**Pragati's Exam Buddy** empowers students with essential tools to stay organized, practice effectively, and maintain well-being. Thoughtfully built to support every student’s unique learning journey with care and dedication."
+    )
+    st.divider()
+
+
+    with st.expander(" 📧 Share Feedback", expanded=False):
+        st.write("Help shape the app—your ideas matter!")
+        bu_txt = st.text_input("Describe the suggestion...", key="bug_input")
+        if st.button("Submit", key="bug_btn"):
+            if not bu_txt.strip():
+                st.warning("Please add details.")
+            else:
+                st.success("Feedback sent! Thanks for helping us improve.")
@@ -0,0 +1,40 @@
+"""Subject notes: filters, search and downloads."""
+import streamlit as st
+
+from catalog import apply_search, get_subject_notes, get_subject_notes_page, list_page, table_version
+from views.common import (file_url, format_pages, format_size, paginate, record_search, show_snippet,
+                          show_suggestions)
+
+
+def render():
+    with st.form("filter_form"):
+        st.markdown("<h1 class='main-heading'>📘 Subject Notes</h1>", unsafe_allow_html=True)
+        reg = st.selectbox("Select Your Regulation", ["--","R19", "R20", "R23"], key="reg_notes")
+        year = st.selectbox("Select Your Year", ["--","1st Year","2nd Year","3rd Year","4th Year"], key="year_notes")
+        subject_search = st.text_input("🔍 Search by subject, filename or topic...", key="search_notes").strip().lower()
+        st.form_submit_button("🚀 Proceed")
+
+    filters = (reg, year, subject_search)
+    try:
+        if subject_search:
+            notes = get_subject_notes(reg, year, version=table_version("subject_notes"))
+            matches = apply_search(notes, subject_search, "subject_notes", name_fields=("subject", "filename"),
+                                   regulation=reg, year=year)
+            page = paginate("notes_pager", filters, lambda offset: list_page(matches, offset))
+        else:
+            page = paginate("notes_pager", filters, lambda cursor: get_subject_notes_page(
+                reg, year, after_id=cursor, version=table_version("subject_notes")))
+    except Exception as e:
+        st.error(f"Error fetching subject notes: {e}")
+        return
+
+    record_search("notes", "subject_notes", subject_search, page["total"])
+    st.success(f"Found {page['total'] or len(page['rows'])} note(s)")
+    if not page["rows"] and subject_search:
+        show_suggestions(subject_search)
+
+    for note in page["rows"]:
+        st.write(f"{note['filename']} — Subject: {note.get('subject', 'N/A')} — "
+                 f"{format_pages(note.get('page_count'))}{format_size(note.get('size'))}")
+        show_snippet(note.get("snippet"))
+        st.link_button("Download", file_url("subject_notes", note["id"]))
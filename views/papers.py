@@ -0,0 +1,74 @@
+"""Question papers: filters, thumbnail grid and page previews."""
+import streamlit as st
+
+import telemetry
+from catalog import apply_search, get_branch_pdfs, get_branch_pdfs_page, list_page, table_version
+from views.common import (file_url, format_pages, format_size, paginate, record_search, show_pdf_preview,
+                          show_snippet, show_suggestions, thumbnail_url)
+
+GRID_COLUMNS = 4
+
+
+def render():
+    st.markdown("<h1 class='main-heading'>🎓 Pragati's Exam Buddy </h1>", unsafe_allow_html=True)
+    st.markdown(
+        '<p class="subheading">Stress less , Score more! Download past papers, Practice hard, and Show those Exams who\'s Boss! 💪📚</p>',
+        unsafe_allow_html=True)
+
+    branch = st.selectbox("Select Your Branch",["--", "CSE", "CSE AI", "CSE AI & ML", "CSE DS", "CSE CYB", "IT", "ECE", "EEE", "Mech", "Civil"])
+    reg = st.selectbox("Select Your Regulation", ["--", "R19", "R20", "R23"])
+    year = st.selectbox("Select Your Year", ["--", "1st Year", "2nd Year", "3rd Year", "4th Year"])
+    sem = st.selectbox("Select Your Semester", ["--", "1 Semester", "2 Semester"])
+    paper_type = st.selectbox("Select Your Paper Type", ["--", "Regular", "Supplementary"])
+    search_term = st.text_input("🔍 Search by subject, topic or question ...").strip().lower()
+
+    if "--" in [branch, reg, year, sem, paper_type]:
+        st.info("Please select all fields to continue.")
+        return
+
+    filters = (branch, reg, year, sem, paper_type, search_term)
+    try:
+        with st.spinner("Fetching PDFs..."):
+            if search_term:
+                pdfs = get_branch_pdfs(branch, reg, year, sem, paper_type, version=table_version("pdfs"))
+                matches = apply_search(pdfs, search_term, "pdfs", branch=branch, regulation=reg, year=year,
+                                       semester=sem)
+                page = paginate("pdfs_pager", filters, lambda offset: list_page(matches, offset))
+            else:
+                page = paginate("pdfs_pager", filters, lambda cursor: get_branch_pdfs_page(
+                    branch, reg, year, sem, paper_type, after_id=cursor, version=table_version("pdfs")))
+    except Exception as e:
+        st.error(f"Error fetching PDFs: {e}")
+        return
+
+    filtered = page["rows"]
+    record_search("pdfs", "pdfs", search_term, page["total"])
+    if filtered:
+        st.success(f"Found {page['total'] or len(filtered)} PDF(s)")
+    else:
+        st.warning("No PDFs found for the selected filters or search.")
+        if search_term:
+            show_suggestions(search_term)
+
+    # Thumbnail grid of the current page only: images come from the file server's cacheable /thumbs route.
+    for row_start in range(0, len(filtered), GRID_COLUMNS):
+        columns = st.columns(GRID_COLUMNS)
+        for idx, pdf in enumerate(filtered[row_start:row_start + GRID_COLUMNS], start=row_start):
+            with columns[idx - row_start].container(border=True):
+                if pdf.get("thumb_hash"):
+                    st.image(thumbnail_url(pdf["thumb_hash"]), use_container_width=True)
+                st.markdown(f"**{pdf['filename']}**")
+                st.caption(f"{format_pages(pdf.get('page_count'))}{format_size(pdf.get('size'))}")
+                show_snippet(pdf.get("snippet"))
+                if st.button("👁 Preview", key=f"preview_btn_{pdf['id']}"):
+                    current = st.session_state.get("preview_pdf")
+                    st.session_state.preview_pdf = None if current == pdf["id"] else pdf["id"]
+                    if st.session_state.preview_pdf:
+                        telemetry.record("preview", "pdfs", pdf["id"], session_id=st.session_state.session_id)
+                st.link_button("📥 Download", file_url("pdfs", pdf["id"]), use_container_width=True)
+
+    previewed = next((pdf for pdf in filtered if pdf["id"] == st.session_state.get("preview_pdf")), None)
+    if previewed:
+        st.divider()
+        st.subheader(f"👁 {previewed['filename']}")
+        show_pdf_preview("pdfs", previewed["id"])
@@ -0,0 +1,126 @@
+"""Weekly quizzes for a year, semester and branch."""
+from datetime import datetime
+
+import streamlit as st
+
+from catalog import get_weekly_quizzes, table_version
+
+
+def render():
+    if st.session_state.get("page") == "Weekly Quiz":
+        with st.form("filter_form"):
+            year = st.selectbox("Select Your Year", ["--", "1st Year", "2nd Year", "3rd Year", "4th Year"])
+            semester = st.selectbox("Select Your Semester", ["--", "1 Semester", "2 Semester"])
+            branch = st.selectbox("Select Your Branch", ["--", "CSE", "CSE AI", "CSE AI & ML", "CSE DS", "CSE CYB", "IT", "ECE", "EEE", "Mech", "Civil"])
+            st.form_submit_button("🚀 Proceed")
+
+        if "--" in [year, semester, branch]:
+            st.warning("Please select your year, semester, and branch to continue.")
+            return
+
+        try:
+            with st.spinner("Fetching latest weekly quizzes..."):
+                quizzes = get_weekly_quizzes(year, semester, branch, version=table_version("weekly_quiz"))
+
+            if quizzes:
+                st.markdown(
+                    """
+                    <style>
+                    .main-heading {
+                        font-size: 2.8rem;
+                        font-weight: 700;
+                        color: #4caf50;
+                        margin-bottom: 0.2rem;
+                    }
+                    .subheading {
+                        font-size: 1.25rem;
+                        color: #555;
+                        margin-bottom: 1.5rem;
+                        font-style: italic;
+                    }
+                    .topics-list li {
+                        font-size: 1.1rem;
+                        margin-bottom: 0.3rem;
+                        color: #212121;
+                    }
+                    .start-btn {
+                        background-color: #4caf50;
+                        color: white;
+                        padding: 0.8rem 2.5rem;
+                        font-size: 1.15rem;
+                        border: none;
+                        border-radius: 10px;
+                        cursor: pointer;
+                        transition: background-color 0.3s ease;
+                        box-shadow: 0 4px 8px rgba(76, 175, 80, 0.2);
+                    }
+                    .start-btn:hover {
+                        background-color: #388e3c;
+                    }
+                    .info-text {
+                        font-size: 1rem;
+                        color: #333;
+                        margin-top: 1rem;
+                        line-height: 1.5;
+                    }
+                    .quiz-container {
+                        margin-bottom: 3rem;
+                        padding: 1.5rem 2rem;
+                        border-radius: 12px;
+                        background-color: #f9fdf9;
+                        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
+                        border: 1px solid #d0e8d0;
+                    }
+                    </style>
+                    """,
+                    unsafe_allow_html=True
+                )
+
+                for quiz in quizzes:
+                    title = quiz.get("title", "Weekly Quiz")
+                    description = quiz.get("description", "")
+                    topics = quiz.get("topics", "")
+                    duration = quiz.get("duration", "N/A")
+                    total_questions = quiz.get("total_questions", "N/A")
+                    form_link = quiz.get("form_link", "#")
+                    expire_at = quiz.get("expire_at")
+
+                    if expire_at:
+                        expire_dt = datetime.fromisoformat(expire_at)
+                        expire_str = expire_dt.strftime("%d %b %Y, %I:%M %p")
+                    else:
+                        expire_str = "N/A"
+
+                    topics_html = ""
+                    if topics:
+                        topics_html = '<h3 class="topics-title">Topics Covered</h3><ul class="topics-list">'
+                        for topic in topics.split(","):
+                            topics_html += f"<li>{topic.strip()}</li>"
+                        topics_html += "</ul>"
+
+                    quiz_html = f"""
+                    <div class="quiz-container">
+                        <h1 class="main-heading">📘 {title}</h1>
+                        <p class="subheading">{description}</p>
+                        {topics_html}
+                        <p class="info-text">
+                            ⏱ <strong>Duration:</strong> {duration}<br>
+                            📊 <strong>Total Questions:</strong> {total_questions}<br>
+                            ⏳ <strong>Expires On:</strong> {expire_str}
+                        </p>
+                        <div style="text-align:center; margin-top: 2rem;">
+                            <a href="{form_link}" target="_blank" rel="noopener noreferrer">
+                                <button class="start-btn">🚀 Start Weekly Quiz</button>
+                            </a>
+                        </div>
+                    </div>
+                    """
+
+                    st.markdown(quiz_html, unsafe_allow_html=True)
+
+            else:
+                st.info("No weekly quiz info available yet for the selected combination. Please check back later.")
+
+        except Exception as e:
+            st.error("Error fetching weekly quiz info.")
+            st.exception(e)